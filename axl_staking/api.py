@@ -0,0 +1,317 @@
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from axl_staking.datasets import AXL_SUPPLY, DEFAULT_END_DATE, DEFAULT_START_DATE
+from axl_staking.export import EXPORT_FORMATS, EXPORTS, export_file_name, iter_encoded
+from axl_staking.fixtures import load_snowflake_secrets, warehouse_from_env
+from axl_staking.queries import WarehouseSource
+from axl_staking.service import StakingService
+from axl_staking.snapshots import SnapshotSource
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/v1/datasets"
+EXPORT_PREFIX = "/v1/exports"
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+GZIP_MIN_BYTES = 1024
+MAX_PAGE_SIZE = 10000
+
+
+# --- Metrics API ----------------------------------------------------------------------------------------------------------
+# A small read-only HTTP API next to the dashboard, reading through the same StakingService (query layer, cube, caches
+# and background refresher), so a client polling it costs no more warehouse queries than another dashboard session.
+#
+#   python -m axl_staking.api --port 8600 --snapshot-dir snapshots
+#
+#   GET /v1/datasets                                   list of datasets and their parameters
+#   GET /v1/datasets/<name>?start=2024-01-01&end=2024-06-30&format=json|arrow&limit=100&offset=0
+#   GET /v1/exports/<name>?start=2024-01-01&end=2024-06-30&format=csv|parquet   full dataset, chunked transfer
+#
+# Responses carry an ETag derived from the served watermark and the request, so If-None-Match gets a 304 until new
+# staking data lands; bodies are gzipped when the client accepts it.
+def _kpi(column, fn):
+    return lambda service, start_date, end_date, watermark: pd.DataFrame(
+        [{column: fn(service, start_date, end_date, watermark)}])
+
+
+def _validator_net_stake(service, start_date, end_date, watermark):
+    df = service.net_delegated_per_validator(watermark)
+    df = df.copy()
+    df["Share of Supply"] = df["Net Delegate Amount"] / AXL_SUPPLY * 100
+    return df
+
+
+# name -> (takes a date range, loader(service, start, end, watermark))
+DATASETS = {
+    "share_of_staked_tokens": (True, _kpi(
+        "Share of Staked Tokens From Supply",
+        lambda service, s, e, wm: service.share_of_staked_tokens(s, e, watermark=wm))),
+    "current_net_staked": (True, _kpi(
+        "Current Net Staked",
+        lambda service, s, e, wm: service.current_net_staked(s, e, watermark=wm))),
+    "current_delegators": (True, _kpi(
+        "Current Number of Delegators",
+        lambda service, s, e, wm: service.current_number_of_delegators(s, e, watermark=wm))),
+    "delegate_kpis": (True, lambda service, s, e, wm: service.delegate_kpis(s, e, watermark=wm)),
+    "top_delegators": (True, lambda service, s, e, wm: service.top_delegators(s, e, watermark=wm)),
+    "monthly_share_data": (True, lambda service, s, e, wm: service.monthly_share_data(s, e, watermark=wm)),
+    "monthly_delegation_data": (True, lambda service, s, e, wm: service.monthly_delegation_data(s, e, watermark=wm)),
+    "action_summary_by_type": (True, lambda service, s, e, wm: service.action_summary_by_type(s, e, watermark=wm)),
+    "users_breakdown": (True, lambda service, s, e, wm: service.users_breakdown(s, e, watermark=wm)),
+    "validator_net_stake": (False, _validator_net_stake),
+    "new_delegators": (False, lambda service, s, e, wm: service.new_delegators(wm)),
+    "redelegate_data": (False, lambda service, s, e, wm: service.redelegate_data(wm)),
+    "unlock_schedule": (False, lambda service, s, e, wm: service.unlock_schedule(wm)),
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_date(params, name, default):
+    value = params.get(name, [None])[0]
+    if not value:
+        return default
+    try:
+        return pd.to_datetime(value).date()
+    except (ValueError, TypeError):
+        raise BadRequest(f"invalid {name} date: {value!r}")
+
+
+def parse_int(params, name, default, maximum=None):
+    value = params.get(name, [None])[0]
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequest(f"invalid {name}: {value!r}")
+    if number < 0:
+        raise BadRequest(f"{name} must be >= 0")
+    return min(number, maximum) if maximum is not None else number
+
+
+def etag_for(name, watermark, start_date, end_date, fmt, limit, offset):
+    key = json.dumps([name, list(watermark), str(start_date), str(end_date), fmt, limit, offset], default=str)
+    return '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def accepts_gzip(header):
+    for part in (header or "").split(","):
+        coding, _, q = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return q.strip() not in ("q=0", "q=0.0")
+    return False
+
+
+def frame_to_json(df):
+    records = json.loads(df.to_json(orient="records", date_format="iso"))
+    return json.dumps({"columns": [str(column) for column in df.columns], "rows": records}).encode()
+
+
+def frame_to_arrow(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render_dataset(service, name, params):
+    if name not in DATASETS:
+        return None
+    ranged, loader = DATASETS[name]
+    start_date = parse_date(params, "start", DEFAULT_START_DATE) if ranged else None
+    end_date = parse_date(params, "end", DEFAULT_END_DATE) if ranged else None
+    if ranged and start_date > end_date:
+        raise BadRequest("start must not be after end")
+    fmt = params.get("format", ["json"])[0]
+    if fmt not in ("json", "arrow"):
+        raise BadRequest(f"unsupported format: {fmt!r}")
+    limit = parse_int(params, "limit", MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    offset = parse_int(params, "offset", 0)
+
+    watermark = service.current_watermark()
+    etag = etag_for(name, watermark, start_date, end_date, fmt, limit, offset)
+
+    def body():
+        if ranged:
+            service.refresher.record_view(start_date, end_date)
+        df = loader(service, start_date, end_date, watermark).iloc[offset:offset + limit]
+        if fmt == "arrow":
+            return frame_to_arrow(df), ARROW_MIME
+        return frame_to_json(df), "application/json"
+
+    return etag, watermark, body
+
+
+def make_handler(service, max_age_seconds):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.info("%s %s", self.address_string(), format % args)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = parse_qs(url.query)
+            path = url.path.rstrip("/")
+            try:
+                if path == API_PREFIX:
+                    listing = {
+                        name: {"range": ranged, "formats": ["json", "arrow"]}
+                        for name, (ranged, _) in DATASETS.items()
+                    }
+                    return self._send(HTTPStatus.OK, json.dumps({"datasets": listing}).encode(), "application/json")
+                if path == EXPORT_PREFIX:
+                    listing = {
+                        name: {"description": description, "formats": sorted(EXPORT_FORMATS)}
+                        for name, (description, _, _) in EXPORTS.items()
+                    }
+                    return self._send(HTTPStatus.OK, json.dumps({"exports": listing}).encode(), "application/json")
+                if path.startswith(EXPORT_PREFIX + "/"):
+                    return self._export(path[len(EXPORT_PREFIX) + 1:], params)
+                if not path.startswith(API_PREFIX + "/"):
+                    return self._error(HTTPStatus.NOT_FOUND, "not found")
+                rendered = render_dataset(service, path[len(API_PREFIX) + 1:], params)
+                if rendered is None:
+                    return self._error(HTTPStatus.NOT_FOUND, "unknown dataset")
+                etag, watermark, body = rendered
+                headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age_seconds}"}
+                if watermark[0] is not None:
+                    headers["X-Data-Watermark"] = watermark[0]
+                if etag_matches(self.headers.get("If-None-Match"), etag):
+                    return self._send(HTTPStatus.NOT_MODIFIED, b"", None, headers)
+                payload, mime = body()
+                return self._send(HTTPStatus.OK, payload, mime, headers)
+            except BadRequest as e:
+                return self._error(HTTPStatus.BAD_REQUEST, str(e))
+            except Exception:
+                logger.exception("Failed to serve %s", self.path)
+                return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal error")
+
+        def _export(self, name, params):
+            if name not in EXPORTS:
+                return self._error(HTTPStatus.NOT_FOUND, "unknown export")
+            start_date = parse_date(params, "start", DEFAULT_START_DATE)
+            end_date = parse_date(params, "end", DEFAULT_END_DATE)
+            if start_date > end_date:
+                raise BadRequest("start must not be after end")
+            fmt = params.get("format", ["csv"])[0]
+            if fmt not in EXPORT_FORMATS:
+                raise BadRequest(f"unsupported format: {fmt!r}")
+            watermark = service.current_watermark()
+            # Pull the first block before committing to a 200 so query errors still get a proper status.
+            blocks = iter_encoded(service.export(name, start_date, end_date, watermark=watermark), fmt)
+            first = next(blocks, b"")
+            compress = fmt == "csv" and accepts_gzip(self.headers.get("Accept-Encoding"))
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", EXPORT_FORMATS[fmt][0])
+            self.send_header("Content-Disposition",
+                             f'attachment; filename="{export_file_name(name, start_date, end_date, fmt)}"')
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Cache-Control", "no-store")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            gzipper = zlib.compressobj(5, zlib.DEFLATED, 31) if compress else None
+            try:
+                for block in itertools.chain([first], blocks):
+                    self._write_chunk(gzipper.compress(block) if gzipper else block)
+                if gzipper:
+                    self._write_chunk(gzipper.flush())
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                logger.info("Client went away during export of %s", name)
+                blocks.close()
+            except Exception:
+                # Headers are gone already; dropping the connection without the final chunk marks it truncated.
+                logger.exception("Export of %s failed mid-stream", name)
+            self.close_connection = True
+
+        def _write_chunk(self, data):
+            if data:
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        def _error(self, status, message):
+            self._send(status, json.dumps({"error": message}).encode(), "application/json")
+
+        def _send(self, status, payload, mime, headers=None):
+            headers = dict(headers or {})
+            headers["Vary"] = "Accept-Encoding"
+            if (status == HTTPStatus.OK and len(payload) >= GZIP_MIN_BYTES
+                    and accepts_gzip(self.headers.get("Accept-Encoding"))):
+                payload = gzip.compress(payload, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+            self.send_response(status)
+            if mime:
+                self.send_header("Content-Type", mime)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            if status != HTTPStatus.NOT_MODIFIED:
+                self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if status != HTTPStatus.NOT_MODIFIED:
+                self.wfile.write(payload)
+
+    return MetricsHandler
+
+
+def make_server(service, host="127.0.0.1", port=8600, max_age_seconds=60):
+    return ThreadingHTTPServer((host, port), make_handler(service, max_age_seconds))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve AXL staking metrics as JSON or Arrow over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--snapshot-dir", default=os.environ.get("AXL_STAKING_SNAPSHOT_DIR", ""),
+                        help="Serve a Parquet snapshot instead of querying the warehouse.")
+    parser.add_argument("--secrets", default=os.path.join(".streamlit", "secrets.toml"),
+                        help="Streamlit secrets file holding the [snowflake] section.")
+    parser.add_argument("--max-age", type=int, default=60, help="Cache-Control max-age in seconds.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args(argv)
+    if args.snapshot_dir:
+        source = SnapshotSource(args.snapshot_dir)
+    else:
+        source = WarehouseSource(warehouse_from_env(lambda: load_snowflake_secrets(args.secrets)))
+    service = StakingService(source).start()
+    server = make_server(service, args.host, args.port, args.max_age)
+    logger.info("Serving metrics on http://%s:%d%s", args.host, args.port, API_PREFIX)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.refresher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+RETENTION_THRESHOLD = 0.001
+
+
+def month_index(days):
+    # Months since 1970-01 for an array of datetime64 days.
+    return np.asarray(days, dtype="datetime64[M]").astype(np.int64)
+
+
+# --- Delegator Cohort Retention -----------------------------------------------------------------------------------------
+# Groups addresses by the month of their first delegation and follows them month by month: how many still hold at
+# least `threshold` AXL delegated (net of undelegations, as in load_daily_active_delegators) at each month end after
+# joining, and how much they hold. One pass over the cube: per-address monthly net changes are scattered into an
+# addresses x months matrix, a cumulative sum along the months gives every balance timeline at once, and the cohort x age
+# cells are filled by bincount over the flattened timelines. No per-cohort join, so the whole history is one call.
+def cohort_retention(cube, threshold=RETENTION_THRESHOLD):
+    columns = ["Cohort", "Months Since", "Cohort Size", "Retained", "Retention", "Retained Stake"]
+    facts = cube.slice(actions=["delegate", "undelegate"])
+    if facts.empty:
+        return pd.DataFrame(columns=columns)
+
+    is_delegate = (facts["Action"] == "delegate").to_numpy()
+    amounts = facts["Amount"].to_numpy(dtype=np.float64)
+    months = month_index(facts["Day"].to_numpy())
+    first_month = months.min()
+    n_months = int(month_index(np.datetime64(cube.last_day, "D")) - first_month) + 1
+    months = months - first_month
+    _, address = np.unique(facts["Delegator"].cat.codes.to_numpy(), return_inverse=True)
+    n_addresses = int(address.max()) + 1
+
+    changes = np.zeros((n_addresses, n_months), dtype=np.float64)
+    np.add.at(changes, (address, months), np.where(is_delegate, amounts, -amounts))
+    balances = np.cumsum(changes, axis=1)
+
+    cohort = np.full(n_addresses, n_months, dtype=np.int64)
+    np.minimum.at(cohort, address[is_delegate], months[is_delegate])
+    joined = cohort < n_months
+    balances, cohort = balances[joined], cohort[joined]
+
+    age = np.arange(n_months)[None, :] - cohort[:, None]
+    observed = age >= 0
+    held = (balances >= threshold) & observed
+    cells = (cohort[:, None] * n_months + age)[observed]
+    retained = np.bincount(cells, weights=held[observed], minlength=n_months * n_months).reshape(n_months, n_months)
+    stake = np.bincount(
+        cells, weights=np.where(held, balances, 0.0)[observed], minlength=n_months * n_months
+    ).reshape(n_months, n_months)
+    sizes = np.bincount(cohort, minlength=n_months)
+
+    # Keep the cells that exist: non-empty cohorts, ages up to the last observed month.
+    steps = np.arange(n_months)
+    cohort_pos, age_pos = np.nonzero((sizes[:, None] > 0) & (steps[None, :] < n_months - steps[:, None]))
+    size = sizes[cohort_pos]
+    return pd.DataFrame({
+        "Cohort": pd.to_datetime((cohort_pos + first_month).astype("datetime64[M]")),
+        "Months Since": age_pos,
+        "Cohort Size": size,
+        "Retained": retained[cohort_pos, age_pos].astype(np.int64),
+        "Retention": retained[cohort_pos, age_pos] / size,
+        "Retained Stake": stake[cohort_pos, age_pos].round(1),
+    }, columns=columns)
+
+
+def retention_between(retention, start_date, end_date):
+    # Cohorts whose first delegation falls in the range, followed up to the latest month.
+    start = pd.Timestamp(start_date).to_period("M").start_time
+    cohorts = retention[(retention["Cohort"] >= start) & (retention["Cohort"] <= pd.Timestamp(end_date))]
+    return cohorts.reset_index(drop=True)
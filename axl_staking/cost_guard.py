@@ -0,0 +1,95 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from axl_staking.lifecycle import QueryCancelled, QueryTimeout
+from axl_staking.single_flight import flight_key
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_TIMEOUT_SECONDS = 30
+# A failed EXPLAIN is remembered this long, so memo misses in the meantime run unguarded without asking again.
+EXPLAIN_FAILURE_TTL_SECONDS = 300
+
+QueryCost = namedtuple("QueryCost", ["partitions_total", "partitions_assigned", "bytes_assigned"])
+CostBudget = namedtuple("CostBudget", ["max_bytes", "max_partitions"])
+
+# Per heavy loader: the most a single execution may scan before the page degrades to a local fallback.
+LOADER_BUDGETS = {
+    "range_summary": CostBudget(max_bytes=8 * 2**30, max_partitions=8000),
+    "top_delegators": CostBudget(max_bytes=8 * 2**30, max_partitions=8000),
+    "daily_active_delegators": CostBudget(max_bytes=16 * 2**30, max_partitions=16000),
+}
+
+
+def explain(db, query):
+    # Compile-only: Snowflake's plan carries the pruned partition and byte counts without running the query.
+    df = db.run_query(f"EXPLAIN USING JSON {query}", timeout=EXPLAIN_TIMEOUT_SECONDS)
+    stats = json.loads(df.iloc[0, 0])["GlobalStats"]
+    return QueryCost(
+        int(stats.get("partitionsTotal", 0)),
+        int(stats.get("partitionsAssigned", 0)),
+        int(stats.get("bytesAssigned", 0)),
+    )
+
+
+def over_budget(cost, budget):
+    return cost.bytes_assigned > budget.max_bytes or cost.partitions_assigned > budget.max_partitions
+
+
+# --- Cost Guard ---------------------------------------------------------------------------------------------------------
+# Pre-flight check for the heavy loaders: EXPLAIN the query, compare the estimate with the loader's budget and report
+# whether to degrade. Estimates are cached per query text, so a range is only explained once. A failed EXPLAIN (e.g. no
+# fixture for it in replay mode) fails open and is remembered for `failure_ttl_seconds`; a cancelled or timed-out one
+# propagates like any other query of a superseded rerun, rather than letting the heavy query run unguarded.
+class CostGuard:
+    def __init__(self, db, budgets=None, max_entries=256, failure_ttl_seconds=EXPLAIN_FAILURE_TTL_SECONDS):
+        self.db = db
+        self.budgets = LOADER_BUDGETS if budgets is None else budgets
+        self.max_entries = max_entries
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self._costs = OrderedDict()
+        self._failed = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, entries, key, value):
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def cost(self, query):
+        key = flight_key(query)
+        with self._lock:
+            if key in self._costs:
+                self._costs.move_to_end(key)
+                return self._costs[key]
+            failed_at = self._failed.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < self.failure_ttl_seconds:
+                return None
+        try:
+            cost = explain(self.db, query)
+        except (QueryCancelled, QueryTimeout):
+            raise
+        except Exception:
+            logger.exception("EXPLAIN failed; running the query unguarded for %ds", self.failure_ttl_seconds)
+            self._remember(self._failed, key, time.monotonic())
+            return None
+        self._remember(self._costs, key, cost)
+        return cost
+
+    def check(self, loader, query):
+        # None when the query fits its budget (or has none), else a short description of the overrun.
+        budget = self.budgets.get(loader)
+        if budget is None:
+            return None
+        cost = self.cost(query)
+        if cost is None or not over_budget(cost, budget):
+            return None
+        return (
+            f"{loader} would scan {cost.bytes_assigned / 2**30:.1f} GiB in {cost.partitions_assigned:,} partitions "
+            f"(budget {budget.max_bytes / 2**30:.0f} GiB / {budget.max_partitions:,})"
+        )
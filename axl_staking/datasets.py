@@ -0,0 +1,260 @@
+import pandas as pd
+
+from axl_staking.prefix_index import PrefixIndex
+from axl_staking.rollup_cube import SIZE_BUCKET_LABELS, period_start, size_bucket
+
+AXL_SUPPLY = 1008585017
+DEFAULT_START_DATE = pd.to_datetime("2022-08-01").date()
+DEFAULT_END_DATE = pd.to_datetime("2025-07-30").date()
+
+
+# --- Local Datasets -----------------------------------------------------------------------------------------------------
+# Everything the dashboard derives from the daily rollup cube and the prefix-sum indexes without touching the warehouse.
+def action_measure(wide, measure, action):
+    if (measure, action) in wide.columns:
+        return wide[(measure, action)].values
+    return 0
+
+
+def daily_stake_flow(cube):
+    daily = cube.rollup("day", actions=["delegate", "undelegate"])
+    wide = daily.pivot(index="Period", columns="Action", values="Amount").fillna(0)
+    delegate_amount = wide["delegate"] if "delegate" in wide.columns else 0
+    undelegate_amount = wide["undelegate"] if "undelegate" in wide.columns else 0
+    return pd.DataFrame({
+        "Date": wide.index,
+        "Delegate Amount": delegate_amount,
+        "Undelegate Amount": undelegate_amount,
+        "Net Flow": delegate_amount - undelegate_amount,
+    })
+
+
+def daily_active_delegators(cube, threshold=0.001):
+    # Local twin of load_daily_active_delegators: per day, how many addresses hold at least `threshold` AXL of
+    # delegations net of undelegations. Each address contributes +1 / -1 on the days it crosses the threshold.
+    facts = cube.slice(actions=["delegate", "undelegate"])
+    if facts.empty:
+        return pd.DataFrame(columns=["Date", "Users"])
+    signed = facts["Amount"].where(facts["Action"] == "delegate", -facts["Amount"])
+    changes = (
+        pd.DataFrame({"Delegator": facts["Delegator"].astype(str), "Day": facts["Day"], "Change": signed})
+        .groupby(["Delegator", "Day"], sort=True)["Change"].sum()
+        .reset_index()
+    )
+    active = changes.groupby("Delegator")["Change"].cumsum() >= threshold
+    was_active = active.groupby(changes["Delegator"]).shift(fill_value=False)
+    crossings = (active.astype(int) - was_active.astype(int)).groupby(changes["Day"]).sum()
+    days = pd.date_range(crossings.index.min(), cube.last_day, freq="D")
+    return pd.DataFrame({"Date": days, "Users": crossings.reindex(days, fill_value=0).cumsum().values})
+
+
+def build_stake_indexes(cube, daily_active_delegators):
+    flow_index = PrefixIndex.from_frame(daily_stake_flow(cube), "Date", "Net Flow")
+    delegators_index = PrefixIndex.from_levels(daily_active_delegators, "Date", "Users")
+    return flow_index, delegators_index
+
+
+# --- Row1, Row4, Row8: KPIs ---
+def current_net_staked(flow_index, start_date, end_date):
+    if flow_index.count_between(start_date, end_date) > 0:
+        return round(flow_index.between(start_date, end_date), 1)
+    else:
+        return None
+
+
+def share_of_staked_tokens(flow_index, start_date, end_date):
+    net = current_net_staked(flow_index, start_date, end_date)
+    if net is not None:
+        return round(net / AXL_SUPPLY * 100, 2)
+    else:
+        return None
+
+
+def current_number_of_delegators(delegators_index, end_date):
+    if len(delegators_index) > 0:
+        return int(delegators_index.as_of(end_date))
+    else:
+        return None
+
+
+# --- Row2: Share Chart ---
+def monthly_share_data(cube, start_date, end_date, grain="month"):
+    # Only amounts are used here, so distinct users can come from the cheap sketches.
+    trend = monthly_delegation_data(cube, start_date, end_date, grain, approx=True)
+    if trend.empty:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        "MONTHLY": trend["monthly"],
+        "Share of Staked Tokens From Supply": trend["Net Delegated Amount"] / AXL_SUPPLY * 100,
+    })
+
+
+# --- Row3, Row7, Row10: Range Summary ---
+# Per-action totals (Bucket missing) and per-action x size-bucket address counts, the same long shape the warehouse's
+# GROUPING SETS query returns, from one groupby over the range. The three sections below only split it. Distinct users
+# fall out of the per-address pass exactly, so the local path has no approximate variant.
+def range_summary(cube, start_date, end_date):
+    facts = cube.slice(start_date, end_date, actions=["delegate", "undelegate"])
+    per_address = (
+        facts.groupby(["Action", "Delegator"], observed=True)
+        .agg(Amount=("Amount", "sum"), Txns=("Txns", "sum"), Events=("Events", "sum"))
+        .reset_index()
+    )
+    per_address["Bucket"] = size_bucket(per_address["Amount"]).astype(str)
+    totals = per_address.groupby("Action", observed=True).agg(
+        Amount=("Amount", "sum"), Txns=("Txns", "sum"), Events=("Events", "sum"), Users=("Delegator", "size")
+    ).reset_index()
+    buckets = per_address.groupby(["Action", "Bucket"], observed=True).agg(
+        Amount=("Amount", "sum"), Txns=("Txns", "sum"), Events=("Events", "sum"), Users=("Delegator", "size")
+    ).reset_index()
+    summary = pd.concat([totals.assign(Bucket=None), buckets], ignore_index=True)
+    summary["Action"] = summary["Action"].astype(str)
+    return summary[["Action", "Bucket", "Amount", "Txns", "Events", "Users"]]
+
+
+def _summary_totals(summary):
+    return summary[summary["Bucket"].isna()].sort_values("Action", kind="stable")
+
+
+# --- Period Comparison ---
+# Two range summaries side by side: the measures of both periods per action and size bucket, with the change and the
+# percentage change (missing where the comparison period has none) as whole-column operations.
+COMPARED_MEASURES = ["Amount", "Txns", "Events", "Users"]
+
+
+def range_comparison(summary, compare_summary):
+    keys = ["Action", "Bucket"]
+    current, previous = (
+        df.assign(Bucket=df["Bucket"].fillna(""))[keys + COMPARED_MEASURES] for df in (summary, compare_summary)
+    )
+    merged = current.merge(previous, on=keys, how="outer", suffixes=("", " (Compare)"))
+    for measure in COMPARED_MEASURES:
+        now, before = merged[measure].fillna(0), merged[f"{measure} (Compare)"].fillna(0)
+        merged[measure], merged[f"{measure} (Compare)"] = now, before
+        merged[f"{measure} Change"] = now - before
+        merged[f"{measure} % Change"] = ((now - before) / before.where(before != 0) * 100).round(1)
+    return merged.sort_values(keys, kind="stable").reset_index(drop=True)
+
+
+# --- Row3: Delegate KPIs ---
+def delegate_kpis(summary):
+    delegate = _summary_totals(summary)
+    delegate = delegate[delegate["Action"] == "delegate"]
+    if delegate.empty:
+        return pd.DataFrame()
+    row = delegate.iloc[0]
+    return pd.DataFrame([{
+        "AMOUNT": round(row["Amount"], 2),
+        "TXNS": int(row["Txns"]),
+        "USER": int(row["Users"]),
+        "AVG_AMOUNT": round(row["Amount"] / row["Events"], 2),
+    }])
+
+
+# --- Row5,6: Delegation Data ---
+# Staking messages (fact_staking rows) per period rather than transactions: the cube keeps COUNT(DISTINCT tx_id) per
+# day x address cell only, and summing those counts a transaction once for every cell it touches.
+def monthly_delegation_data(cube, start_date, end_date, grain="month", approx=False):
+    monthly = cube.rollup(grain, start_date, end_date, actions=["delegate", "undelegate"], approx=approx)
+    if monthly.empty:
+        return pd.DataFrame()
+    wide = monthly.pivot(index="Period", columns="Action", values=["Amount", "Events", "Users"]).fillna(0)
+    delegate_amount = action_measure(wide, "Amount", "delegate")
+    undelegate_amount = -action_measure(wide, "Amount", "undelegate")
+    df = pd.DataFrame({
+        "monthly": wide.index,
+        "Delegate Amount": delegate_amount,
+        "Undelegate Amount": undelegate_amount,
+        "Delegate Messages": action_measure(wide, "Events", "delegate"),
+        "Undelegate Messages": -action_measure(wide, "Events", "undelegate"),
+        "Delegators": action_measure(wide, "Users", "delegate"),
+        "Undelegators": -action_measure(wide, "Users", "undelegate"),
+        "Net Delegated Amount": (delegate_amount + undelegate_amount).cumsum(),
+    })
+    return df.round({"Delegate Amount": 1, "Undelegate Amount": 1, "Net Delegated Amount": 1})
+
+
+# --- Row7: Users, Txns & Amount By Action ---
+def action_summary_by_type(summary):
+    totals = _summary_totals(summary)
+    return pd.DataFrame({
+        "Type": totals["Action"].str.capitalize(),
+        "Amount": totals["Amount"].round(1),
+        "Txns": totals["Txns"],
+        "Users": totals["Users"],
+    }).reset_index(drop=True)
+
+
+# --- Row9: Top Delegators ---
+def delegator_totals(facts):
+    # Per-address delegate/undelegate totals of `facts`, for every address that delegated, in address order. Counts are
+    # staking messages, which sum exactly over the cube's cells (distinct transactions would not).
+    per_address = (
+        facts.assign(Action=facts["Action"].astype(str), Delegator=facts["Delegator"].astype(str))
+        .groupby(["Delegator", "Action"])
+        .agg(Amount=("Amount", "sum"), Events=("Events", "sum"))
+        .unstack("Action")
+        .reindex(columns=pd.MultiIndex.from_product([["Amount", "Events"], ["delegate", "undelegate"]]))
+    )
+    per_address = per_address[per_address[("Amount", "delegate")].notna()].fillna(0)
+    delegate = per_address.xs("delegate", axis=1, level=1)
+    undelegate = per_address.xs("undelegate", axis=1, level=1)
+    df = pd.DataFrame({
+        "Delegator Address": per_address.index,
+        "Delegate Amount": delegate["Amount"].round(1).values,
+        "Undelegate Amount": undelegate["Amount"].round(1).values,
+        "Net Delegated": (delegate["Amount"].round(1) - undelegate["Amount"].round(1)).values,
+        "Delegate Messages": delegate["Events"].astype(int).values,
+        "Undelegate Messages": undelegate["Events"].astype(int).values,
+        "Avg Delegate Txns": (delegate["Amount"] / delegate["Events"]).round(1).values,
+        "Avg Undelegate Txns": (undelegate["Amount"] / undelegate["Events"].where(undelegate["Events"] > 0)).fillna(0).round(1).values,
+    })
+    return df
+
+
+def top_delegators(cube, start_date, end_date, limit=1000):
+    facts = cube.slice(start_date, end_date, actions=["delegate", "undelegate"])
+    if facts.empty:
+        return pd.DataFrame()
+    df = delegator_totals(facts)
+    df = df.sort_values("Net Delegated", ascending=False, kind="stable").head(limit).reset_index(drop=True)
+    df.index = df.index + 1
+    return df
+
+
+# --- Row10: Users Breakdown ---
+def users_breakdown(summary):
+    buckets = summary[summary["Bucket"].notna()].copy()
+    buckets["Bucket"] = pd.Categorical(buckets["Bucket"], categories=SIZE_BUCKET_LABELS, ordered=True)
+    buckets = buckets.sort_values(["Action", "Bucket"], kind="stable")
+    return pd.DataFrame({
+        "Users Count": buckets["Users"],
+        "Type": buckets["Action"].str.capitalize(),
+        "Category": buckets["Bucket"].astype(str),
+    }).reset_index(drop=True)
+
+
+# --- Row12: New Delegators ---
+def monthly_new_delegators(cube, start_date, end_date, grain="month"):
+    new = cube.new_by_period("Delegator", grain, start_date, end_date, actions=["delegate"])
+    return new.rename(columns={
+        "Period": "Month",
+        "New": "New Delegators",
+        "Cumulative": "Cumulative New Delegators",
+    })
+
+
+# --- Row14,15: Validator Set ---
+def monthly_new_validators(lifecycle, start_date, end_date, grain="month"):
+    # `lifecycle` is validators.validator_lifecycle over the whole history at this grain, so entries, exits and
+    # first-time entries at the start of the range are measured against the set before it.
+    start = period_start(pd.Series([pd.Timestamp(start_date)]), grain).iloc[0]
+    periods = lifecycle[(lifecycle["Period"] >= start) & (lifecycle["Period"] <= pd.Timestamp(end_date))]
+    return pd.DataFrame({
+        "Month": periods["Period"],
+        "New Validators": periods["New Validators"],
+        "Cumulative New Validators": periods["New Validators"].cumsum(),
+        "Active Validators": periods["Active Validators"],
+        "Entered": periods["Entered"],
+        "Exited": periods["Exited"],
+    }).reset_index(drop=True)
@@ -0,0 +1,232 @@
+import argparse
+import io
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from axl_staking import datasets
+from axl_staking.fixtures import load_snowflake_secrets, warehouse_from_env
+from axl_staking.queries import WarehouseSource, staking_events_query, top_delegators_query, validator_ledger_query
+from axl_staking.rollup_cube import RollupCube
+from axl_staking.snapshots import SnapshotSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 50000
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+# --- Bulk Export --------------------------------------------------------------------------------------------------------
+# Streams full datasets (no LIMIT) to CSV or Parquet chunk by chunk. Against a live warehouse the rows come from
+# `fetch_pandas_batches`; otherwise (snapshots, fixtures) they are cut from the local rollup cube. Either way only one
+# chunk is held at a time, and the encoded bytes go straight to a file or an HTTP response.
+#
+#   python -m axl_staking.export delegators --start 2024-01-01 --end 2024-12-31 --format parquet --out delegators.parquet
+def _local_delegators(cube, start_date, end_date, chunk_rows):
+    # Addresses are taken `chunk_rows` at a time in category-code order: one argsort of the codes over the range, then
+    # each batch groups only its own rows, so at most one batch of per-address totals is held at a time.
+    facts = cube.slice(start_date, end_date, actions=["delegate", "undelegate"])
+    codes = facts["Delegator"].cat.codes.to_numpy()
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    n_codes = len(facts["Delegator"].cat.categories)
+    for lo in range(0, n_codes, chunk_rows):
+        start, stop = np.searchsorted(sorted_codes, [lo, lo + chunk_rows], "left")
+        if stop > start:
+            yield datasets.delegator_totals(facts.iloc[order[start:stop]])
+
+
+def _day_chunks(facts, chunk_rows):
+    # Row chunks of the (day-sorted) ledger, cut on day boundaries so per-day groups never straddle two chunks.
+    days = facts["Day"].values
+    lo = 0
+    while lo < len(days):
+        hi = min(lo + chunk_rows, len(days))
+        if hi < len(days):
+            hi = max(np.searchsorted(days, days[hi - 1], "right"), lo + 1)
+        yield facts.iloc[lo:hi]
+        lo = hi
+
+
+def _plain(df):
+    return df.astype({col: str for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+
+def _local_validator_ledger(cube, start_date, end_date, chunk_rows):
+    for facts in _day_chunks(cube.slice(start_date, end_date), chunk_rows):
+        ledger = (
+            facts.groupby(["Day", "Validator", "Action"], observed=True, sort=True)
+            .agg(Amount=("Amount", "sum"), Txns=("Txns", "sum"), Events=("Events", "sum"),
+                 Delegators=("Delegator", "nunique"))
+            .reset_index()
+            .rename(columns={"Day": "Date"})
+        )
+        yield _plain(ledger)
+
+
+def _local_events(cube, start_date, end_date, chunk_rows):
+    columns = ["Date", "Action", "Validator", "Source Validator", "Delegator", "Amount", "Txns", "Events"]
+    for facts in _day_chunks(cube.slice(start_date, end_date), chunk_rows):
+        yield _plain(facts.rename(columns={"Day": "Date"})[columns])
+
+
+# name -> (description, warehouse query(start, end), local chunker(cube, start, end, chunk_rows))
+EXPORTS = {
+    "delegators": (
+        "Per-address delegate/undelegate totals over the range, every address (the top-1000 table without its limit).",
+        lambda start_date, end_date: top_delegators_query(start_date, end_date, limit=None),
+        _local_delegators,
+    ),
+    "validator_ledger": (
+        "Daily amount, transactions and distinct delegators per validator and action.",
+        validator_ledger_query,
+        _local_validator_ledger,
+    ),
+    "events": (
+        "Daily per-address staking ledger (date x action x validator x delegator) for the range.",
+        lambda start_date, end_date: staking_events_query(start_date, end_date),
+        _local_events,
+    ),
+}
+
+
+def _rechunk(batches, chunk_rows):
+    for batch in batches:
+        for lo in range(0, len(batch), chunk_rows):
+            yield batch.iloc[lo:lo + chunk_rows]
+
+
+def iter_export(name, start_date, end_date, db=None, cube=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # `cube` may be a callable so the local path is only built when the warehouse cannot stream.
+    if name not in EXPORTS:
+        raise KeyError(f"unknown export: {name!r}")
+    _, query, local = EXPORTS[name]
+    if db is not None and hasattr(db, "iter_query"):
+        return _rechunk(db.iter_query(query(start_date, end_date)), chunk_rows)
+    cube = cube() if callable(cube) else cube
+    if cube is None:
+        raise ValueError("export needs a streaming warehouse or a local cube")
+    return local(cube, start_date, end_date, chunk_rows)
+
+
+class _DrainSink(io.RawIOBase):
+    # Write-only file handed to the Parquet writer: buffers bytes until drained while keeping the absolute position
+    # the writer needs for its footer offsets.
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_encoded(chunks, fmt):
+    if fmt == "csv":
+        header = True
+        for chunk in chunks:
+            yield chunk.to_csv(index=False, header=header).encode()
+            header = False
+        return
+    if fmt != "parquet":
+        raise ValueError(f"unsupported export format: {fmt!r}")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _DrainSink()
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema, compression="zstd")
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.drain()
+
+
+def export_file_name(name, start_date, end_date, fmt):
+    return f"axl_{name}_{start_date}_{end_date}.{EXPORT_FORMATS[fmt][1]}"
+
+
+def write_export(chunks, fmt, out):
+    # Writes to `out` (path or binary file object) and returns the number of bytes written.
+    if isinstance(out, (str, os.PathLike)):
+        with open(f"{out}.tmp", "wb") as f:
+            written = write_export(chunks, fmt, f)
+        os.replace(f"{out}.tmp", out)
+        return written
+    written = 0
+    for data in iter_encoded(chunks, fmt):
+        out.write(data)
+        written += len(data)
+    return written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream an AXL staking dataset to CSV or Parquet.")
+    parser.add_argument("dataset", choices=sorted(EXPORTS))
+    parser.add_argument("--start", default=str(datasets.DEFAULT_START_DATE), help="Range start (YYYY-MM-DD).")
+    parser.add_argument("--end", default=str(datasets.DEFAULT_END_DATE), help="Range end (YYYY-MM-DD).")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--out", help="Output file (default: axl_<dataset>_<start>_<end>.<ext>).")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--snapshot-dir", default=os.environ.get("AXL_STAKING_SNAPSHOT_DIR", ""),
+                        help="Export from a Parquet snapshot instead of querying the warehouse.")
+    parser.add_argument("--secrets", default=os.path.join(".streamlit", "secrets.toml"),
+                        help="Streamlit secrets file holding the [snowflake] section.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args(argv)
+    start_date = pd.to_datetime(args.start).date()
+    end_date = pd.to_datetime(args.end).date()
+    out = args.out or export_file_name(args.dataset, start_date, end_date, args.format)
+
+    if args.snapshot_dir:
+        db = None
+        source = SnapshotSource(args.snapshot_dir)
+    else:
+        db = warehouse_from_env(lambda: load_snowflake_secrets(args.secrets))
+        source = WarehouseSource(db)
+    started = time.perf_counter()
+    chunks = iter_export(
+        args.dataset, start_date, end_date,
+        db=db,
+        cube=lambda: RollupCube(source.staking_events()),
+        chunk_rows=args.chunk_rows,
+    )
+    written = write_export(chunks, args.format, out)
+    logger.info("Wrote %s (%.1f MiB) in %.1fs", out, written / 2**20, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+
+from axl_staking.lifecycle import QUERIES, QueryCancelled, QueryRunner, QueryTimeout
+from axl_staking.single_flight import SingleFlight, flight_key, normalize_sql
+
+FIXTURES_MODE_ENV = "AXL_STAKING_FIXTURES_MODE"
+FIXTURES_DIR_ENV = "AXL_STAKING_FIXTURES_DIR"
+REPLAY_LATENCY_ENV = "AXL_STAKING_REPLAY_LATENCY_MS"
+
+
+# Process-wide count of replayed queries, read by the load test harness.
+REPLAY_STATS = {"queries": 0}
+
+
+class FixtureNotFound(LookupError):
+    pass
+
+
+def fixture_paths(fixtures_dir, query, params=None):
+    key = flight_key(query, params)
+    return os.path.join(fixtures_dir, f"{key}.arrow"), os.path.join(fixtures_dir, f"{key}.json")
+
+
+# --- Record -------------------------------------------------------------------------------------------------------------
+# Wraps a live warehouse and stores every result as an Arrow IPC file next to a JSON sidecar holding the normalized SQL,
+# bind parameters and how long the warehouse took.
+class RecordingWarehouse:
+    def __init__(self, inner, fixtures_dir):
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def run_query(self, query, params=None, timeout=None, shared=True):
+        started = time.perf_counter()
+        df = self.inner.run_query(query, params, timeout, shared)
+        duration = time.perf_counter() - started
+        import pyarrow as pa
+        arrow_path, meta_path = fixture_paths(self.fixtures_dir, query, params)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        with pa.OSFile(f"{arrow_path}.tmp", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(f"{arrow_path}.tmp", arrow_path)
+        with open(meta_path, "w") as f:
+            json.dump({
+                "sql": normalize_sql(query),
+                "params": repr(params),
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "duration_seconds": round(duration, 4),
+                "rows": int(len(df)),
+            }, f, indent=2)
+        return df
+
+    def iter_query(self, query, params=None, timeout=None):
+        # Bulk exports are streamed straight through and not recorded.
+        return self.inner.iter_query(query, params, timeout)
+
+    def close(self):
+        self.inner.close()
+
+
+# --- Replay -------------------------------------------------------------------------------------------------------------
+# Serves recorded results through the same run_query interface. Latency is either a fixed delay with optional jitter or
+# the recorded warehouse duration times `latency_scale`, and identical concurrent queries are coalesced exactly as they
+# would be against Snowflake. The simulated wait honours statement timeouts and superseded-rerun cancellation too.
+class ReplayWarehouse:
+    def __init__(self, fixtures_dir, latency_seconds=0.0, jitter=0.0, use_recorded_latency=False, latency_scale=1.0,
+                 single_flight=None, registry=QUERIES):
+        self.fixtures_dir = fixtures_dir
+        self.latency_seconds = latency_seconds
+        self.jitter = jitter
+        self.use_recorded_latency = use_recorded_latency
+        self.latency_scale = latency_scale
+        self.single_flight = single_flight or SingleFlight(lock_dir=os.path.join(fixtures_dir, ".single_flight"))
+        self.registry = registry
+        self.runner = QueryRunner(registry)
+        self.queries_served = 0
+
+    def _delay(self, meta_path):
+        if self.use_recorded_latency:
+            with open(meta_path) as f:
+                delay = json.load(f)["duration_seconds"] * self.latency_scale
+        else:
+            delay = self.latency_seconds
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(delay, 0.0)
+
+    def _wait(self, key, delay, timeout):
+        deadline = time.monotonic() + delay
+        started = time.monotonic()
+        self.registry.start(key, lambda: None)
+        try:
+            while True:
+                if self.registry.is_cancelled(key):
+                    raise QueryCancelled("Replayed query cancelled: no current rerun is waiting on it")
+                if timeout is not None and time.monotonic() - started > timeout:
+                    raise QueryTimeout(f"Replayed query exceeded its {timeout}s statement timeout")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                time.sleep(min(remaining, 0.05))
+        finally:
+            self.registry.finish(key)
+
+    def _replay(self, key, query, params, timeout):
+        arrow_path, meta_path = fixture_paths(self.fixtures_dir, query, params)
+        if not os.path.exists(arrow_path):
+            raise FixtureNotFound(f"No fixture for query: {normalize_sql(query)[:200]}")
+        import pyarrow as pa
+        self._wait(key, self._delay(meta_path), timeout)
+        with pa.memory_map(arrow_path, "r") as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas()
+        self.queries_served += 1
+        REPLAY_STATS["queries"] += 1
+        return df
+
+    def run_query(self, query, params=None, timeout=None, shared=True):
+        key = flight_key(query, params)
+        return self.runner.run(
+            key, lambda: self.single_flight.do(
+                query, params, lambda: self._replay(key, query, params, timeout), shared=shared)
+        )
+
+    def close(self):
+        self.runner.shutdown()
+
+
+def load_snowflake_secrets(secrets_path):
+    # The [snowflake] section of a Streamlit secrets file, for the CLIs that run outside Streamlit.
+    import tomllib
+
+    with open(secrets_path, "rb") as f:
+        return tomllib.load(f)["snowflake"]
+
+
+def warehouse_from_env(load_snowflake_secrets, environ=None):
+    # Picks live, record or replay mode from the environment; replay never calls `load_snowflake_secrets`.
+    environ = os.environ if environ is None else environ
+    mode = environ.get(FIXTURES_MODE_ENV, "").lower()
+    fixtures_dir = environ.get(FIXTURES_DIR_ENV, "fixtures")
+    if mode == "replay":
+        latency = environ.get(REPLAY_LATENCY_ENV, "0")
+        if latency == "recorded":
+            return ReplayWarehouse(fixtures_dir, use_recorded_latency=True)
+        return ReplayWarehouse(fixtures_dir, latency_seconds=float(latency) / 1000)
+    from axl_staking.warehouse import Warehouse
+    db = Warehouse(load_snowflake_secrets())
+    if mode == "record":
+        return RecordingWarehouse(db, fixtures_dir)
+    return db
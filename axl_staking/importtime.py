@@ -0,0 +1,114 @@
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_SCRIPT = os.path.join(REPO_ROOT, "📊Main_Dashboard.py")
+# Heavy packages that must only load once the section needing them runs. Only imports made by the dashboard or by
+# axl_staking modules count: pandas 2.x loads pyarrow on its own, which nothing here can defer.
+DEFERRED_PACKAGES = ["plotly", "snowflake", "cryptography", "pyarrow"]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def startup_modules(script=DASHBOARD_SCRIPT):
+    # The modules the dashboard imports before its first statement that is not an import, i.e. everything that loads
+    # before the header and date controls are on screen. Read from the script itself so the list cannot go stale.
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+        else:
+            break
+    return list(dict.fromkeys(modules))
+
+
+# --- Import-Time Benchmark ----------------------------------------------------------------------------------------------
+# Runs `python -X importtime` over the startup imports in a clean interpreter, reports the slowest packages, and exits
+# non-zero when the total exceeds the budget or a deferred package leaks into startup:
+#
+#   python -m axl_staking.importtime --budget-ms 1500
+def measure(modules, python=sys.executable):
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", "; ".join(f"import {module}" for module in modules)],
+        capture_output=True, text=True, cwd=REPO_ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return entries
+
+
+def summarize(entries, top=15):
+    top_level = [entry for entry in entries if entry["depth"] == 0]
+    total_ms = sum(entry["cumulative_ms"] for entry in top_level)
+    slowest = sorted(entries, key=lambda entry: entry["cumulative_ms"], reverse=True)[:top]
+    return total_ms, slowest
+
+
+def importers(entries):
+    # -X importtime lists a module after everything it imported, one level less indented: the importer of each entry is
+    # the next entry at a lower depth (None for the top-level imports of the measured statement).
+    parents = [None] * len(entries)
+    pending = []
+    for i, entry in enumerate(entries):
+        while pending and entries[pending[-1]]["depth"] > entry["depth"]:
+            parents[pending.pop()] = entry["module"]
+        pending.append(i)
+    return parents
+
+
+def leaked(entries, deferred=DEFERRED_PACKAGES):
+    # Deferred packages imported directly by the measured statement or by an axl_staking module.
+    found = set()
+    for entry, parent in zip(entries, importers(entries)):
+        package = entry["module"].split(".")[0]
+        if package in deferred and (parent is None or parent.split(".")[0] == "axl_staking"):
+            found.add(package)
+    return sorted(found)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure dashboard startup import time.")
+    parser.add_argument("--budget-ms", type=float, default=0, help="Fail when total import time exceeds this.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to print.")
+    parser.add_argument("--module", action="append", default=[], help="Extra module to include.")
+    args = parser.parse_args(argv)
+
+    entries = measure(startup_modules() + args.module)
+    total_ms, slowest = summarize(entries, args.top)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in slowest:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {entry['module']}")
+    print(f"\nTotal startup import time: {total_ms:.1f} ms")
+
+    failures = []
+    leaks = leaked(entries)
+    if leaks:
+        failures.append(f"deferred packages imported at startup: {', '.join(leaks)}")
+    if args.budget_ms and total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
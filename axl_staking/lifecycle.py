@@ -0,0 +1,167 @@
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+_scope = contextvars.ContextVar("axl_staking_query_scope", default=None)
+_checkpoint = contextvars.ContextVar("axl_staking_query_checkpoint", default=None)
+
+WAIT_POLL_SECONDS = 0.1
+# How often a blocked run touches its page at most; each touch is a message to the browser.
+HEARTBEAT_SECONDS = 1.0
+
+
+class QueryCancelled(RuntimeError):
+    pass
+
+
+class QueryTimeout(TimeoutError):
+    pass
+
+
+def current_scope():
+    return _scope.get()
+
+
+def checkpoint():
+    # Calls the current scope's checkpoint, if any: where Streamlit interrupts a superseded run that is blocked waiting.
+    fn = _checkpoint.get()
+    if fn is not None:
+        fn()
+
+
+def throttled(fn, interval_seconds=HEARTBEAT_SECONDS):
+    # `fn` run at most once per `interval_seconds`, for checkpoints that cost more than the wait loop polling them.
+    last = [float("-inf")]
+
+    def call():
+        now = time.monotonic()
+        if now - last[0] >= interval_seconds:
+            last[0] = now
+            fn()
+
+    return call
+
+
+# --- Query Lifecycle ----------------------------------------------------------------------------------------------------
+# Tracks which (session, rerun generation) scopes are waiting on each in-flight warehouse query. A Streamlit rerun calls
+# begin() with its session id, a generation that grows on every rerun and a checkpoint the waiting thread calls while
+# blocked, which is where Streamlit interrupts a superseded run. Once no current-generation scope waits on a running
+# query any more, it is cancelled through the callback its runner registered. Callers outside a scope (background
+# refresher, API, CLIs) count as permanent interest, so a query shared with them always runs to completion.
+class QueryRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._waiters = defaultdict(Counter)
+        self._running = {}
+        self._cancelled = set()
+        self.cancelled_count = 0
+
+    def begin(self, session, generation, checkpoint=None):
+        scope = (session, generation)
+        _scope.set(scope)
+        _checkpoint.set(checkpoint)
+        with self._lock:
+            if generation > self._generations.get(session, -1):
+                self._generations[session] = generation
+            cancels = self._sweep(list(self._running))
+        self._cancel_all(cancels)
+        return scope
+
+    def _live(self, scope):
+        return scope is None or scope[1] >= self._generations.get(scope[0], scope[1])
+
+    def _sweep(self, keys):
+        cancels = []
+        for key in keys:
+            cancel = self._running.get(key)
+            if cancel is None or key in self._cancelled:
+                continue
+            if not any(self._live(scope) for scope in self._waiters.get(key, ())):
+                self._cancelled.add(key)
+                cancels.append((key, cancel))
+        return cancels
+
+    def _cancel_all(self, cancels):
+        for key, cancel in cancels:
+            self.cancelled_count += 1
+            logger.info("Cancelling superseded query %s", key[:12])
+            try:
+                cancel()
+            except Exception:
+                logger.exception("Failed to cancel superseded query %s", key[:12])
+
+    def _join(self, key, scope):
+        with self._lock:
+            self._waiters[key][scope] += 1
+
+    def _leave(self, key, scope):
+        with self._lock:
+            waiters = self._waiters[key]
+            waiters[scope] -= 1
+            if waiters[scope] <= 0:
+                del waiters[scope]
+            if not waiters:
+                del self._waiters[key]
+            cancels = self._sweep([key])
+        self._cancel_all(cancels)
+
+    def start(self, key, cancel):
+        # Called by the worker executing `key`; the query may already be unwanted by then.
+        with self._lock:
+            self._running[key] = cancel
+            cancels = self._sweep([key])
+        self._cancel_all(cancels)
+
+    def finish(self, key):
+        with self._lock:
+            self._running.pop(key, None)
+            self._cancelled.discard(key)
+
+    def is_cancelled(self, key):
+        return key in self._cancelled
+
+
+QUERIES = QueryRegistry()
+
+
+# --- Query Runner -------------------------------------------------------------------------------------------------------
+# Executes queries on a small worker pool so the calling (script) thread only waits: identical in-flight queries share
+# one future, and each waiter polls it, calling its scope's checkpoint in between. A waiter that leaves early (rerun,
+# stop, error) simply drops the future; the registry cancels the query once nobody current is left waiting.
+class QueryRunner:
+    def __init__(self, registry=QUERIES, max_workers=8):
+        self.registry = registry
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="axl-query")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, fn):
+        scope = current_scope()
+        self.registry._join(key, scope)
+        try:
+            with self._lock:
+                future = self._futures.get(key)
+                if future is None:
+                    future = self._futures[key] = self._executor.submit(fn)
+                    future.add_done_callback(lambda done: self._forget(key, done))
+            while True:
+                try:
+                    return future.result(timeout=WAIT_POLL_SECONDS).copy()
+                except concurrent.futures.TimeoutError:
+                    checkpoint()
+        finally:
+            self.registry._leave(key, scope)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
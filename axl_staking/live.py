@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+from axl_staking.datasets import AXL_SUPPLY
+from axl_staking.queries import TAIL_COLUMNS
+from axl_staking.unbonding import UnbondingQueue
+
+logger = logging.getLogger(__name__)
+
+LIVE_POLL_SECONDS = 15
+ACTIVE_BALANCE_MIN = 0.001
+STAKE_ACTIONS = ["delegate", "undelegate", "redelegate"]
+
+
+# --- Live Tail ------------------------------------------------------------------------------------------------------------
+# Running totals behind the live KPIs, seeded once from the rollup cube and then moved forward by applying each new
+# staking event as a delta: net flow per day, per-delegator balance (and the count at or above ACTIVE_BALANCE_MIN, as in
+# load_daily_active_delegators), the set of addresses that ever delegated, net stake per validator (delegations and
+# redelegations in, undelegations and redelegations out, as in get_net_delegated_per_validator) and the unbonding queue,
+# which each poll advances to the newest event seen. A poll is one query for events at or after the last seen block
+# timestamp and O(new events) work; one tail per process is shared by every session, and polls closer together than
+# `poll_seconds` are skipped.
+#
+# The cube only knows days, not which of the last day's events it already holds, so the seed stops at the day before
+# the cube's last day and the first poll replays that whole day from the tail. Nothing is counted twice whatever the
+# lag between the cube and the watermark probe. Replayed events are already on the static page, so they only move the
+# running totals and the baselines: they are not live activity (new delegators, validator changes, events applied).
+class LiveTail:
+    def __init__(self, fetch_tail, cube, poll_seconds=LIVE_POLL_SECONDS):
+        self.fetch_tail = fetch_tail
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+        # Keys of the applied events at exactly `since`; events at `since` not among them are still new.
+        self._boundary_keys = set()
+
+        last_day = cube.last_day if cube.last_day is not None else pd.Timestamp.utcnow().tz_localize(None).floor("D")
+        self.since = pd.Timestamp(last_day)
+        seeded_until = self.since - pd.Timedelta(days=1)
+        self.replay_until = self.since + pd.Timedelta(days=1)
+        facts = cube.slice(end_date=seeded_until, actions=STAKE_ACTIONS)
+        signed = facts["Amount"].where(facts["Action"] != "undelegate", -facts["Amount"])
+        flows = facts[facts["Action"] != "redelegate"]
+        self.daily_flow = defaultdict(float, (
+            signed[flows.index].groupby(flows["Day"].dt.date).sum().to_dict()
+        ))
+        self.balances = defaultdict(float, (
+            signed[flows.index].groupby(flows["Delegator"].astype(str)).sum().to_dict()
+        ))
+        self.active_delegators = sum(1 for balance in self.balances.values() if balance >= ACTIVE_BALANCE_MIN)
+        self.delegators = set(facts.loc[facts["Action"] == "delegate", "Delegator"].astype(str).unique())
+        outflow = pd.concat([
+            facts.loc[facts["Action"] == "undelegate", "Amount"].groupby(
+                facts.loc[facts["Action"] == "undelegate", "Validator"].astype(str)).sum(),
+            facts.loc[facts["Action"] == "redelegate", "Amount"].groupby(
+                facts.loc[facts["Action"] == "redelegate", "Source Validator"].astype(str)).sum(),
+        ]).groupby(level=0).sum()
+        inflow = facts.loc[facts["Action"] != "undelegate", "Amount"].groupby(
+            facts.loc[facts["Action"] != "undelegate", "Validator"].astype(str)).sum()
+        self.validator_net = defaultdict(float, inflow.sub(outflow, fill_value=0).to_dict())
+        self.base_validator_net = dict(self.validator_net)
+        self.unbonding = UnbondingQueue.from_cube(cube, until=seeded_until)
+
+        self.new_delegators = []
+        self.events_applied = 0
+        self.polls = 0
+        self.last_error = None
+        self.updated_at = None
+        self.version = 0
+
+    def _apply(self, events):
+        # Applies the rows of `events` (TAIL_COLUMNS) in timestamp order; returns the number of live events applied and
+        # the number replayed from the cube's last day.
+        applied = replayed = 0
+        rows = events[TAIL_COLUMNS].itertuples(index=False, name=None)
+        for timestamp, tx_id, action, validator, source, delegator, amount in rows:
+            key = (tx_id, action, validator, source, delegator, amount)
+            if timestamp < self.since or (timestamp == self.since and key in self._boundary_keys):
+                continue
+            amount = float(amount)
+            replay = timestamp < self.replay_until
+            if action == "delegate" or action == "undelegate":
+                signed = amount if action == "delegate" else -amount
+                self.daily_flow[timestamp.date()] += signed
+                was_active = self.balances[delegator] >= ACTIVE_BALANCE_MIN
+                self.balances[delegator] += signed
+                self.active_delegators += (self.balances[delegator] >= ACTIVE_BALANCE_MIN) - was_active
+            if action == "delegate" and delegator not in self.delegators:
+                self.delegators.add(delegator)
+                if not replay:
+                    self.new_delegators.append((timestamp, delegator))
+            moves = []
+            if action == "undelegate":
+                moves.append((validator, -amount))
+                self.unbonding.push(timestamp, amount, delegator, validator)
+            elif action in ("delegate", "redelegate"):
+                moves.append((validator, amount))
+                if action == "redelegate" and source:
+                    moves.append((source, -amount))
+            for moved, delta in moves:
+                self.validator_net[moved] += delta
+                if replay:
+                    self.base_validator_net[moved] = self.base_validator_net.get(moved, 0.0) + delta
+            if timestamp > self.since:
+                self.since = timestamp
+                self._boundary_keys = set()
+            self._boundary_keys.add(key)
+            if replay:
+                replayed += 1
+            else:
+                applied += 1
+        return applied, replayed
+
+    def poll(self, force=False):
+        if not force and time.monotonic() - self._last_poll < self.poll_seconds:
+            return 0
+        with self._lock:
+            if not force and time.monotonic() - self._last_poll < self.poll_seconds:
+                return 0
+            self._last_poll = time.monotonic()
+            try:
+                events = self.fetch_tail(self.since)
+            except Exception as e:
+                logger.exception("Live tail poll failed")
+                self.last_error = str(e)
+                return 0
+            self.last_error = None
+            self.polls += 1
+            if events.empty:
+                return 0
+            events = events.assign(Timestamp=pd.to_datetime(events["Timestamp"]))
+            applied, replayed = self._apply(events.sort_values("Timestamp", kind="stable"))
+            # Same clock as the cached view: unlocks are released by the newest event seen, not the wall clock.
+            self.unbonding.advance(self.since)
+            if applied or replayed:
+                self.events_applied += applied
+                self.updated_at = self.since
+                self.version += 1
+            return applied
+
+    def net_staked(self, start_date):
+        start_date = pd.Timestamp(start_date).date()
+        return round(sum(flow for day, flow in self.daily_flow.items() if day >= start_date), 1)
+
+    def kpis(self, start_date):
+        net = self.net_staked(start_date)
+        return {
+            "Share of Staked Tokens From Supply": round(net / AXL_SUPPLY * 100, 2),
+            "Current Net Staked": net,
+            "Current Number of Delegators": self.active_delegators,
+            "Total Delegators": len(self.delegators),
+            "New Delegators (Live)": len(self.new_delegators),
+            "Unbonding": round(self.unbonding.unbonding, 1),
+        }
+
+    def validator_changes(self, limit=10):
+        # Validators whose net stake moved since the tail was seeded, biggest moves first.
+        changes = [
+            (validator, net, net - self.base_validator_net.get(validator, 0.0))
+            for validator, net in self.validator_net.items()
+            if abs(net - self.base_validator_net.get(validator, 0.0)) > 1e-9
+        ]
+        df = pd.DataFrame(changes, columns=["Validator", "Net Delegate Amount", "Change"])
+        return df.reindex(df["Change"].abs().sort_values(ascending=False).index).head(limit).reset_index(drop=True)
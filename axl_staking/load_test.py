@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import random
+import resource
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from axl_staking.datasets import DEFAULT_END_DATE, DEFAULT_START_DATE
+from axl_staking.fixtures import FIXTURES_DIR_ENV, FIXTURES_MODE_ENV, REPLAY_LATENCY_ENV, REPLAY_STATS
+from axl_staking.lifecycle import QUERIES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "📊Main_Dashboard.py")
+RANGE_SPANS_DAYS = [30, 90, 180, 365, 730, None]
+
+
+# --- Concurrent-Session Load Test ---------------------------------------------------------------------------------------
+# Drives N headless Streamlit sessions (AppTest) in one process — i.e. one replica — against an offline backend. Each
+# session loads the page, then keeps picking a new date range after a think time and times the full rerun.
+#
+#   python -m axl_staking.load_test --sessions 20 --duration 120 --fixtures fixtures --latency-ms 800
+def current_rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def random_range(rng):
+    span = rng.choice(RANGE_SPANS_DAYS)
+    if span is None:
+        return DEFAULT_START_DATE, DEFAULT_END_DATE
+    latest_end = pd.Timestamp(DEFAULT_END_DATE)
+    end = latest_end - pd.Timedelta(days=rng.randint(0, 365))
+    start = max(end - pd.Timedelta(days=span), pd.Timestamp(DEFAULT_START_DATE))
+    return start.date(), end.date()
+
+
+def run_session(session_id, deadline, think_time, timeout, latencies, errors, lock):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    first = True
+    while time.monotonic() < deadline:
+        if not first:
+            time.sleep(rng.expovariate(1 / think_time) if think_time > 0 else 0)
+            start, end = random_range(rng)
+            app.date_input(key="start_date").set_value(start)
+            app.date_input(key="end_date").set_value(end)
+        started = time.perf_counter()
+        try:
+            app.run()
+            elapsed = time.perf_counter() - started
+            with lock:
+                if app.exception:
+                    errors.append(str(app.exception[0].value))
+                else:
+                    latencies.append(elapsed)
+        except Exception as exc:
+            with lock:
+                errors.append(repr(exc))
+        first = False
+
+
+def run_load_test(sessions, duration, think_time, timeout):
+    latencies, errors, lock = [], [], threading.Lock()
+    rss_before = current_rss_bytes()
+    cpu_before = time.process_time()
+    queries_before = REPLAY_STATS["queries"]
+    cancelled_before = QUERIES.cancelled_count
+    started = time.monotonic()
+    deadline = started + duration
+    threads = [
+        threading.Thread(target=run_session, args=(i, deadline, think_time, timeout, latencies, errors, lock), daemon=True)
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+    cpu = time.process_time() - cpu_before
+    samples = np.array(latencies) if latencies else np.array([np.nan])
+    return {
+        "sessions": sessions,
+        "wall_seconds": round(wall, 2),
+        "renders": len(latencies),
+        "errors": len(errors),
+        "first_errors": errors[:5],
+        "p50_seconds": round(float(np.nanpercentile(samples, 50)), 3),
+        "p95_seconds": round(float(np.nanpercentile(samples, 95)), 3),
+        "p99_seconds": round(float(np.nanpercentile(samples, 99)), 3),
+        "cpu_seconds": round(cpu, 2),
+        "cpu_cores_used": round(cpu / wall, 2) if wall else None,
+        "rss_start_mb": round(rss_before / 2**20, 1),
+        "rss_end_mb": round(current_rss_bytes() / 2**20, 1),
+        "rss_growth_mb": round((current_rss_bytes() - rss_before) / 2**20, 1),
+        "warehouse_queries": REPLAY_STATS["queries"] - queries_before,
+        "cancelled_queries": QUERIES.cancelled_count - cancelled_before,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the AXL staking dashboard.")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent headless sessions.")
+    parser.add_argument("--duration", type=float, default=60, help="Test length in seconds.")
+    parser.add_argument("--think-time", type=float, default=5, help="Mean seconds between a session's interactions.")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-render timeout in seconds.")
+    parser.add_argument("--fixtures", default="fixtures", help="Replay fixtures directory.")
+    parser.add_argument("--latency-ms", default="0", help='Injected warehouse latency in ms, or "recorded".')
+    parser.add_argument("--snapshot-dir", default="", help="Serve a snapshot instead of replaying fixtures.")
+    parser.add_argument("--json", default="", help="Also write the report to this path.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.snapshot_dir:
+        os.environ["AXL_STAKING_SNAPSHOT_DIR"] = args.snapshot_dir
+    else:
+        os.environ[FIXTURES_MODE_ENV] = "replay"
+        os.environ[FIXTURES_DIR_ENV] = args.fixtures
+        os.environ[REPLAY_LATENCY_ENV] = args.latency_ms
+    report = run_load_test(args.sessions, args.duration, args.think_time, args.timeout)
+    for key, value in report.items():
+        print(f"{key:>18}: {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from axl_staking.lifecycle import WAIT_POLL_SECONDS, QueryCancelled, checkpoint
+
+logger = logging.getLogger(__name__)
+
+CACHE_BUDGET_ENV = "AXL_STAKING_CACHE_BUDGET_MB"
+DEFAULT_CACHE_BUDGET_MB = 512
+
+
+def deep_nbytes(obj):
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if hasattr(obj, "nbytes"):
+        return int(obj.nbytes)
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(deep_nbytes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_nbytes(k) + deep_nbytes(v) for k, v in obj.items())
+    return sys.getsizeof(obj)
+
+
+def figure_nbytes(fig):
+    # Trace payload of a Plotly figure — the part that grows with the data.
+    total = 0
+    for trace in fig.data:
+        for attr in ("x", "y", "values", "labels", "text", "customdata"):
+            value = getattr(trace, attr, None)
+            if value is not None and not isinstance(value, str):
+                total += deep_nbytes(np.asarray(value))
+                if np.asarray(value).dtype == object:
+                    total += sum(sys.getsizeof(item) for item in np.asarray(value).ravel())
+    return total
+
+
+def payload_nbytes(obj):
+    # Size of what st.plotly_chart / st.dataframe is handed: a figure, a Styler or a DataFrame.
+    if hasattr(obj, "data") and hasattr(obj, "layout"):
+        return figure_nbytes(obj)
+    if isinstance(getattr(obj, "data", None), pd.DataFrame):
+        return deep_nbytes(obj.data)
+    return deep_nbytes(obj)
+
+
+class _Entry:
+    __slots__ = ("loader", "args", "value", "nbytes", "cost_seconds", "hits", "last_access")
+
+    def __init__(self, loader, args, value, nbytes, cost_seconds):
+        self.loader = loader
+        self.args = args
+        self.value = value
+        self.nbytes = nbytes
+        self.cost_seconds = cost_seconds
+        self.hits = 0
+        self.last_access = time.monotonic()
+
+    @property
+    def score(self):
+        # Recompute time saved per byte held; the lowest-scoring entries are evicted first.
+        return (self.hits + 1) * max(self.cost_seconds, 1e-3) / max(self.nbytes, 1)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# --- Memory Accountant --------------------------------------------------------------------------------------------------
+# A process-wide, byte-budgeted memo cache for the loaders, plus size tracking for long-lived resources (rollup cube,
+# prefix indexes) and the figures of the current run. Cached values are shared between sessions and must be treated as
+# read-only by callers. The budget bounds the memoised loader results only: tracked resources and figures are reported
+# next to it but never evicted or counted against it, so the process footprint is the budget plus those.
+#
+# Concurrent misses on the same key share one call: the first caller computes, the rest wait on it (calling their
+# rerun's checkpoint while blocked). If the computing caller was superseded or stopped, a waiter retries in its place.
+class MemoryAccountant:
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.entries = {}
+        self.inflight = {}
+        self.resources = {}
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        return cls(int(float(environ.get(CACHE_BUDGET_ENV, DEFAULT_CACHE_BUDGET_MB)) * 2**20))
+
+    def memoize(self, fn, name=None):
+        loader = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = (loader, args)
+            while True:
+                with self.lock:
+                    entry = self.entries.get(key)
+                    if entry is not None:
+                        entry.hits += 1
+                        entry.last_access = time.monotonic()
+                        return entry.value
+                    flight = self.inflight.get(key)
+                    if flight is None:
+                        flight = self.inflight[key] = _Flight()
+                        break
+                while not flight.done.wait(WAIT_POLL_SECONDS):
+                    checkpoint()
+                if flight.error is None:
+                    return flight.value
+                if not isinstance(flight.error, QueryCancelled) and isinstance(flight.error, Exception):
+                    raise flight.error
+            try:
+                started = time.perf_counter()
+                value = fn(*args)
+                entry = _Entry(loader, args, value, deep_nbytes(value), time.perf_counter() - started)
+                with self.lock:
+                    self.entries[key] = entry
+                    self._enforce_budget(keep=key)
+                flight.value = value
+                return value
+            except BaseException as exc:
+                flight.error = exc
+                raise
+            finally:
+                with self.lock:
+                    del self.inflight[key]
+                flight.done.set()
+
+        wrapper.clear = lambda: self.clear(loader)
+        return wrapper
+
+    def track(self, name, size_fn):
+        self.resources[name] = size_fn
+
+    def clear(self, loader=None):
+        with self.lock:
+            for key in [key for key in self.entries if loader is None or key[0] == loader]:
+                del self.entries[key]
+
+    @property
+    def cached_bytes(self):
+        return sum(entry.nbytes for entry in self.entries.values())
+
+    def _enforce_budget(self, keep):
+        total = self.cached_bytes
+        if total <= self.budget_bytes:
+            return
+        for key, entry in sorted(self.entries.items(), key=lambda item: (item[1].score, item[1].last_access)):
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entry.nbytes
+            del self.entries[key]
+            self.evictions += 1
+        logger.info("Cache over budget: evicted down to %.1f MB (%d evictions so far)", total / 2**20, self.evictions)
+
+    def report(self, figures=None):
+        with self.lock:
+            rows = [
+                {"Kind": "cache", "Name": entry.loader, "Args": repr(entry.args), "Bytes": entry.nbytes,
+                 "Hits": entry.hits, "Cost (s)": round(entry.cost_seconds, 3)}
+                for entry in self.entries.values()
+            ]
+        for name, size_fn in self.resources.items():
+            rows.append({"Kind": "resource", "Name": name, "Args": "", "Bytes": size_fn(), "Hits": None, "Cost (s)": None})
+        for section, nbytes in (figures or {}).items():
+            rows.append({"Kind": "figure", "Name": section, "Args": "", "Bytes": nbytes, "Hits": None, "Cost (s)": None})
+        df = pd.DataFrame(rows, columns=["Kind", "Name", "Args", "Bytes", "Hits", "Cost (s)"])
+        df["MB"] = (df["Bytes"] / 2**20).round(3)
+        return df.sort_values("Bytes", ascending=False).reset_index(drop=True)
+
+    def totals(self, figures=None):
+        report = self.report(figures)
+        totals = report.groupby("Kind")["Bytes"].sum().to_dict()
+        totals["budget"] = self.budget_bytes
+        totals["evictions"] = self.evictions
+        return totals
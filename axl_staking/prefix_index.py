@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+
+# --- Prefix-Sum Index ---------------------------------------------------------------------------------------------------
+# Holds a sorted array of days and the running sum of a daily series over them, so that the level "as of" any date is
+# one binary search and the change over any range is the difference of two prefix values.
+class PrefixIndex:
+    def __init__(self, days, values):
+        order = np.argsort(np.asarray(days, dtype="datetime64[D]"), kind="stable")
+        self.days = np.asarray(days, dtype="datetime64[D]")[order]
+        self.prefix = np.cumsum(np.asarray(values, dtype="float64")[order])
+
+    @classmethod
+    def from_frame(cls, df, day_col, value_col):
+        if df.empty:
+            return cls([], [])
+        return cls(pd.to_datetime(df[day_col]).values, df[value_col].fillna(0).values)
+
+    @classmethod
+    def from_levels(cls, df, day_col, level_col):
+        # A level series (e.g. active delegators per day) is indexed through its day-over-day changes.
+        if df.empty:
+            return cls([], [])
+        df = df.sort_values(day_col)
+        levels = df[level_col].fillna(0).values.astype("float64")
+        return cls(pd.to_datetime(df[day_col]).values, np.diff(levels, prepend=0.0))
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        return self.days.nbytes + self.prefix.nbytes
+
+    @property
+    def first_day(self):
+        return pd.Timestamp(self.days[0]).date() if len(self.days) else None
+
+    @property
+    def last_day(self):
+        return pd.Timestamp(self.days[-1]).date() if len(self.days) else None
+
+    def _position(self, day):
+        # Index of the last entry on or before `day`, -1 if `day` precedes the series.
+        return int(np.searchsorted(self.days, np.datetime64(pd.Timestamp(day).date(), "D"), side="right")) - 1
+
+    def as_of(self, day):
+        pos = self._position(day)
+        return float(self.prefix[pos]) if pos >= 0 else 0.0
+
+    def between(self, start_date, end_date):
+        # Sum of the daily series over [start_date, end_date], both inclusive.
+        before = self._position(pd.Timestamp(start_date) - pd.Timedelta(days=1))
+        last = self._position(end_date)
+        if last < 0:
+            return 0.0
+        return float(self.prefix[last] - (self.prefix[before] if before >= 0 else 0.0))
+
+    def count_between(self, start_date, end_date):
+        before = self._position(pd.Timestamp(start_date) - pd.Timedelta(days=1))
+        return max(self._position(end_date) - before, 0)
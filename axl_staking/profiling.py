@@ -0,0 +1,156 @@
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+from axl_staking.memory import payload_nbytes
+
+logger = logging.getLogger(__name__)
+
+PROFILE_QUERY_PARAM = "profile"
+
+
+# --- Section Profiler ---------------------------------------------------------------------------------------------------
+# Splits one script run into per-section data fetch, figure build and serialize/send time. `fetch` wraps loader calls,
+# `mark` opens the next "Row N" section, and `send` wraps st.plotly_chart / st.dataframe; whatever runs between a mark
+# and the next send is counted as build.
+class RenderProfiler:
+    PHASES = ["fetch", "build", "send"]
+
+    def __init__(self):
+        self.records = []
+        self.payloads = defaultdict(int)
+        self.section = None
+        self._checkpoint = time.perf_counter()
+        self._started = self._checkpoint
+
+    def _record(self, section, phase, seconds):
+        self.records.append((section, phase, seconds))
+
+    def _close_build(self):
+        now = time.perf_counter()
+        if self.section is not None:
+            self._record(self.section, "build", now - self._checkpoint)
+        self._checkpoint = now
+
+    def fetch(self, section, loader, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return loader(*args, **kwargs)
+        finally:
+            self._record(section, "fetch", time.perf_counter() - started)
+            self._checkpoint = time.perf_counter()
+
+    def mark(self, section):
+        self._close_build()
+        self.section = section
+
+    def send(self, render, payload, *args, **kwargs):
+        self._close_build()
+        section = self.section or "Page"
+        self.payloads[section] += payload_nbytes(payload)
+        started = time.perf_counter()
+        try:
+            return render(payload, *args, **kwargs)
+        finally:
+            self._record(section, "send", time.perf_counter() - started)
+            self._checkpoint = time.perf_counter()
+
+    def finish(self):
+        self._close_build()
+        self.section = None
+        total = time.perf_counter() - self._started
+        logger.info("Render %.0f ms: %s", total * 1000, self.summary()["Total (ms)"].to_dict())
+        return total
+
+    def summary(self):
+        if not self.records:
+            return pd.DataFrame(columns=[f"{phase} (ms)" for phase in self.PHASES] + ["Total (ms)"])
+        df = pd.DataFrame(self.records, columns=["Section", "Phase", "Seconds"])
+        order = list(dict.fromkeys(df["Section"]))
+        table = (
+            df.pivot_table(index="Section", columns="Phase", values="Seconds", aggfunc="sum")
+            .reindex(index=order, columns=self.PHASES)
+            .fillna(0.0) * 1000
+        )
+        table.columns = [f"{phase} (ms)" for phase in self.PHASES]
+        table["Total (ms)"] = table.sum(axis=1)
+        return table.round(1)
+
+
+# --- Whole-Script Profiler ----------------------------------------------------------------------------------------------
+# Opt-in via ?profile=cprofile (pstats) or ?profile=sampling (pyinstrument flamegraph, if installed). A run that ends
+# before the report (st.stop, a rerun, an exception) would leave its profiler enabled on the script thread, so running
+# profilers are registered per thread and the next ScriptProfiler created on that thread stops a leftover one first.
+class ScriptProfiler:
+    _running = {}
+    _running_lock = threading.Lock()
+
+    def __init__(self, mode):
+        self.mode = mode
+        self._profiler = None
+        ScriptProfiler.stop_leftover()
+        if mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif mode == "sampling":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                self.mode = "unavailable"
+            else:
+                self._profiler = Profiler()
+                self._profiler.start()
+        if self._profiler is not None:
+            with ScriptProfiler._running_lock:
+                ScriptProfiler._running[threading.get_ident()] = self
+
+    @classmethod
+    def stop_leftover(cls):
+        with cls._running_lock:
+            leftover = cls._running.pop(threading.get_ident(), None)
+        if leftover is not None:
+            logger.info("Stopping a %s profiler left running by an earlier script run", leftover.mode)
+            leftover._halt()
+
+    @property
+    def active(self):
+        return self._profiler is not None
+
+    def _halt(self):
+        # Stops profiling once; returns the stopped profiler, or None if it was already stopped.
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        with ScriptProfiler._running_lock:
+            if ScriptProfiler._running.get(threading.get_ident()) is self:
+                del ScriptProfiler._running[threading.get_ident()]
+        if self.mode == "cprofile":
+            profiler.disable()
+        else:
+            profiler.stop()
+        return profiler
+
+    def stop(self):
+        # Returns (text report, download bytes, file name, mime type), or None when nothing was profiled. Safe to call
+        # more than once; only the first call reports.
+        profiler = self._halt()
+        if profiler is None:
+            return None
+        if self.mode == "cprofile":
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats("cumulative").print_stats(40)
+            return stream.getvalue(), marshal.dumps(stats.stats), "axl_staking_dashboard.prof", "application/octet-stream"
+        return (
+            profiler.output_text(unicode=True, color=False),
+            profiler.output_html().encode("utf-8"),
+            "axl_staking_dashboard_flamegraph.html",
+            "text/html",
+        )
@@ -0,0 +1,425 @@
+import pandas as pd
+
+from axl_staking.cost_guard import CostGuard
+from axl_staking.freshness import WATERMARK_QUERY, watermark_from_frame
+from axl_staking.rollup_cube import SIZE_BUCKET_EDGES, SIZE_BUCKET_LABELS
+
+
+# Per-loader statement timeouts in seconds; a query still running past its limit is cancelled in Snowflake.
+STATEMENT_TIMEOUTS = {
+    "probe_watermark": 30,
+    "staking_tail": 30,
+    "staking_events": 600,
+    "range_summary": 180,
+    "daily_active_delegators": 600,
+    "top_delegators": 180,
+    "new_delegators": 180,
+    "redelegate_data": 180,
+    "net_delegated_per_validator": 180,
+}
+
+
+# --- Warehouse Queries --------------------------------------------------------------------------------------------------
+# Every dashboard query, taking any object with a `run_query(query, params=None, timeout=None, shared=True)` method that
+# returns a DataFrame. The Streamlit page and the headless snapshot builder both go through these. shared=False keeps a
+# result out of the cross-process single-flight files: the ledger is too big and the tail never repeats.
+def probe_watermark(db):
+    return watermark_from_frame(db.run_query(WATERMARK_QUERY, timeout=STATEMENT_TIMEOUTS["probe_watermark"]))
+
+
+def staking_events_query(since=None, until=None):
+    since_filter = f"AND block_timestamp::date >= '{since}'" if since is not None else ""
+    until_filter = f"AND block_timestamp::date <= '{until}'" if until is not None else ""
+    return f"""
+        SELECT block_timestamp::date AS "Date",
+               action AS "Action",
+               validator_address AS "Validator",
+               IFNULL(redelegate_source_validator_address, '') AS "Source Validator",
+               delegator_address AS "Delegator",
+               SUM(amount)/POW(10,6) AS "Amount",
+               COUNT(DISTINCT tx_id) AS "Txns",
+               COUNT(*) AS "Events"
+        FROM axelar.gov.fact_staking
+        WHERE TX_SUCCEEDED = TRUE
+          {since_filter}
+          {until_filter}
+        GROUP BY 1,2,3,4,5
+        ORDER BY 1 ASC
+    """
+
+
+def load_staking_events(db, since=None):
+    return db.run_query(staking_events_query(since), timeout=STATEMENT_TIMEOUTS["staking_events"], shared=False)
+
+
+TAIL_COLUMNS = ["Timestamp", "Tx ID", "Action", "Validator", "Source Validator", "Delegator", "Amount"]
+
+
+def load_staking_tail(db, since):
+    # Individual staking events at or after `since` (a block timestamp); the live tail polls this with its last seen
+    # timestamp, so each call only scans the newest micro-partitions.
+    query = f"""
+        SELECT block_timestamp AS "Timestamp",
+               tx_id AS "Tx ID",
+               action AS "Action",
+               validator_address AS "Validator",
+               IFNULL(redelegate_source_validator_address, '') AS "Source Validator",
+               delegator_address AS "Delegator",
+               amount/POW(10,6) AS "Amount"
+        FROM axelar.gov.fact_staking
+        WHERE TX_SUCCEEDED = TRUE
+          AND block_timestamp >= '{since}'
+        ORDER BY 1 ASC
+    """
+    return db.run_query(query, timeout=STATEMENT_TIMEOUTS["staking_tail"], shared=False)
+
+
+def size_bucket_sql(column):
+    # SQL twin of rollup_cube.size_bucket: right-inclusive edges, same labels.
+    cases = "\n".join(
+        f"                WHEN {column} <= {edge:.0f} THEN '{label}'"
+        for edge, label in zip(SIZE_BUCKET_EDGES[1:-1], SIZE_BUCKET_LABELS)
+    )
+    return f"CASE\n{cases}\n                ELSE '{SIZE_BUCKET_LABELS[-1]}'\n            END"
+
+
+def distinct_sql(expr, approx=False):
+    return f"APPROX_COUNT_DISTINCT({expr})" if approx else f"COUNT(DISTINCT {expr})"
+
+
+def range_summary_query(start_date, end_date, approx=False):
+    # One scan of fact_staking for Rows 3, 7 and 10: per-action totals (Bucket NULL) and per-action x size-bucket
+    # counts in the same GROUPING SETS pass. Split client-side by datasets.delegate_kpis, action_summary_by_type and
+    # users_breakdown. `approx` swaps the distinct counts for Snowflake's HyperLogLog APPROX_COUNT_DISTINCT.
+    return f"""
+        WITH events AS (
+            SELECT action,
+                   delegator_address,
+                   tx_id,
+                   amount/POW(10,6) AS amount
+            FROM axelar.gov.fact_staking
+            WHERE action IN ('delegate', 'undelegate')
+              AND TX_SUCCEEDED = TRUE
+              AND block_timestamp::date >= '{start_date}'
+              AND block_timestamp::date <= '{end_date}'
+        ),
+        addresses AS (
+            SELECT action,
+                   delegator_address,
+                   {size_bucket_sql("SUM(amount)")} AS bucket
+            FROM events
+            GROUP BY 1,2
+        )
+        SELECT e.action AS "Action",
+               a.bucket AS "Bucket",
+               SUM(e.amount) AS "Amount",
+               {distinct_sql("e.tx_id", approx)} AS "Txns",
+               COUNT(*) AS "Events",
+               {distinct_sql("e.delegator_address", approx)} AS "Users"
+        FROM events e
+        JOIN addresses a
+          ON e.action = a.action AND e.delegator_address = a.delegator_address
+        GROUP BY GROUPING SETS ((e.action), (e.action, a.bucket))
+        ORDER BY 1, 2 NULLS FIRST
+    """
+
+
+def load_range_summary(db, start_date, end_date, approx=False):
+    query = range_summary_query(start_date, end_date, approx)
+    return db.run_query(query, timeout=STATEMENT_TIMEOUTS["range_summary"])
+
+
+def daily_active_delegators_query():
+    return f"""
+        WITH date_start AS (
+            WITH dates AS (
+                SELECT CAST('2022-02-10' AS DATE) AS start_date 
+                UNION ALL 
+                SELECT DATEADD(day, 1, start_date)
+                FROM dates
+                WHERE start_date < CURRENT_DATE()
+            )
+            SELECT DATE_TRUNC('day', start_date) AS start_date
+            FROM dates
+        ),
+        axl_stakers_balance_change AS (
+            SELECT *
+            FROM (
+                SELECT DATE_TRUNC('day', block_timestamp) AS date,
+                       DELEGATOR_ADDRESS AS user,
+                       SUM(amount)/1e6 AS balance_change
+                FROM (
+                    SELECT block_timestamp, DELEGATOR_ADDRESS, -1 * amount AS amount, tx_id
+                    FROM axelar.gov.fact_staking
+                    WHERE action = 'undelegate' AND tx_succeeded = TRUE
+                    UNION ALL
+                    SELECT block_timestamp, DELEGATOR_ADDRESS, amount, tx_id
+                    FROM axelar.gov.fact_staking
+                    WHERE action = 'delegate' AND tx_succeeded = TRUE
+                )
+                GROUP BY 1,2
+            )
+        ),
+        axl_stakers_historic_holders AS (
+            SELECT user
+            FROM axl_stakers_balance_change
+            GROUP BY 1
+        ),
+        user_dates AS (
+            SELECT start_date, user
+            FROM date_start, axl_stakers_historic_holders
+        ),
+        users_balance AS (
+            SELECT start_date AS "Date", user,
+                   LAG(balance_raw) IGNORE NULLS OVER (PARTITION BY user ORDER BY start_date) AS balance_lag,
+                   IFNULL(balance_raw, balance_lag) AS balance
+            FROM (
+                SELECT start_date, a.user, balance_change,
+                       SUM(balance_change) OVER (PARTITION BY a.user ORDER BY start_date) AS balance_raw
+                FROM user_dates a
+                LEFT JOIN axl_stakers_balance_change b
+                ON date = start_date AND a.user = b.user
+            )
+        )
+        SELECT "Date", COUNT(DISTINCT user) AS "Users"
+        FROM users_balance
+        WHERE balance >= 0.001 AND balance IS NOT NULL
+        GROUP BY 1
+        ORDER BY 1 ASC
+    """
+
+
+def load_daily_active_delegators(db):
+    query = daily_active_delegators_query()
+    return db.run_query(query, timeout=STATEMENT_TIMEOUTS["daily_active_delegators"])
+
+
+def top_delegators_query(start_date, end_date, limit=1000):
+    # `limit=None` keeps every address; the bulk export streams that variant.
+    limit_clause = f"LIMIT {int(limit)}" if limit is not None else ""
+    return f"""
+        WITH delegate AS (
+            SELECT delegator_address,
+                   ROUND(SUM(amount/POW(10,6)),1) AS delegate_amount,
+                   COUNT(*) AS delegate_messages,
+                   ROUND(AVG(amount/POW(10,6)),1) AS avg_delegate_amount
+            FROM axelar.gov.fact_staking
+            WHERE action = 'delegate'
+              AND block_timestamp::date >= '{start_date}'
+              AND block_timestamp::date <= '{end_date}'
+            GROUP BY 1
+        ),
+        undelegate AS (
+            SELECT delegator_address,
+                   ROUND(SUM(amount/POW(10,6)),1) AS undelegate_amount,
+                   COUNT(*) AS undelegate_messages,
+                   ROUND(AVG(amount/POW(10,6)),1) AS avg_undelegate_amount
+            FROM axelar.gov.fact_staking
+            WHERE action = 'undelegate'
+              AND block_timestamp::date >= '{start_date}'
+              AND block_timestamp::date <= '{end_date}'
+            GROUP BY 1
+        )
+        SELECT a.delegator_address AS "Delegator Address",
+               delegate_amount AS "Delegate Amount",
+               IFNULL(undelegate_amount,0) AS "Undelegate Amount",
+               delegate_amount - IFNULL(undelegate_amount,0) AS "Net Delegated",
+               delegate_messages AS "Delegate Messages",
+               IFNULL(undelegate_messages,0) AS "Undelegate Messages",
+               avg_delegate_amount AS "Avg Delegate Txns",
+               IFNULL(avg_undelegate_amount,0) AS "Avg Undelegate Txns"
+        FROM delegate a
+        LEFT JOIN undelegate b
+          ON a.delegator_address = b.delegator_address
+        ORDER BY 4 DESC
+        {limit_clause}
+    """
+
+
+def load_top_delegators(db, start_date, end_date):
+    query = top_delegators_query(start_date, end_date)
+    df = db.run_query(query, timeout=STATEMENT_TIMEOUTS["top_delegators"])
+    if not df.empty:
+        df.index = df.index + 1
+        return df
+    else:
+        return pd.DataFrame()
+
+
+def validator_ledger_query(start_date, end_date):
+    return f"""
+        SELECT block_timestamp::date AS "Date",
+               validator_address AS "Validator",
+               action AS "Action",
+               SUM(amount)/POW(10,6) AS "Amount",
+               COUNT(DISTINCT tx_id) AS "Txns",
+               COUNT(*) AS "Events",
+               COUNT(DISTINCT delegator_address) AS "Delegators"
+        FROM axelar.gov.fact_staking
+        WHERE TX_SUCCEEDED = TRUE
+          AND block_timestamp::date >= '{start_date}'
+          AND block_timestamp::date <= '{end_date}'
+        GROUP BY 1,2,3
+        ORDER BY 1 ASC, 2 ASC
+    """
+
+
+def load_new_delegators(db):
+    query = """
+        WITH new AS (
+            SELECT MIN(block_timestamp) AS daily,
+                   delegator_address
+            FROM axelar.gov.fact_staking
+            WHERE action = 'delegate'
+            GROUP BY 2
+        ),
+        final AS (
+            SELECT TRUNC(daily,'day') AS day,
+                   COUNT(DISTINCT delegator_address) AS new_staker,
+                   SUM(COUNT(DISTINCT delegator_address)) OVER (ORDER BY TRUNC(daily,'day') ASC) AS cumulative_new_staker
+            FROM new
+            GROUP BY 1
+        )
+        SELECT SUM(new_staker) AS "Total Number of New Delegators",
+               ROUND(AVG(new_staker)) AS "Avg Number of Daily Delegators"
+        FROM final
+        WHERE day >= '2025-01-01'
+    """
+    return db.run_query(query, timeout=STATEMENT_TIMEOUTS["new_delegators"])
+
+
+def get_redelegate_data(db):
+    query = """
+    with validators as (
+        select ifnull(b.label, a.validator_address) as source, 
+               ifnull(c.label, a.validator_address) as to_validator,
+               amount/pow(10,6) as amt,
+               tx_id
+        from axelar.gov.fact_staking a 
+        left outer join axelar.gov.fact_validators b 
+            on a.REDELEGATE_SOURCE_VALIDATOR_ADDRESS = b.address
+        left outer join axelar.gov.fact_validators c 
+            on a.VALIDATOR_ADDRESS = c.address
+        where action = 'redelegate'
+          and TX_SUCCEEDED = 'TRUE'
+    )
+    select concat(source, '->', to_validator) as "Validator",
+           sum(amt) as "Redelegate Amount", 
+           avg(amt) as "Avg Amount",
+           count(DISTINCT tx_id) as "Transactions" 
+    from validators 
+    group by 1
+    order by 2 desc 
+    limit 10
+    """
+    return db.run_query(query, timeout=STATEMENT_TIMEOUTS["redelegate_data"])
+
+
+def get_net_delegated_per_validator(db):
+    query = """
+    with delegate as (
+        select validator_address, 
+               tx_id,
+               amount/pow(10,6) as delegate_amt,
+               delegator_address
+        from axelar.gov.fact_staking
+        where action = 'delegate'
+          and TX_SUCCEEDED = 'TRUE'
+        UNION
+        select validator_address, 
+               tx_id,
+               amount/pow(10,6) as delegate_amt,
+               delegator_address
+        from axelar.gov.fact_staking
+        where action = 'redelegate'
+          and TX_SUCCEEDED = 'TRUE'
+    ),
+    undelegate as (
+        select validator_address, 
+               tx_id,
+               amount/pow(10,6) as undelegate_amt,
+               delegator_address
+        from axelar.gov.fact_staking
+        where action = 'undelegate'
+          and TX_SUCCEEDED = 'TRUE'
+          and block_timestamp::date >= '2022-08-01'
+        UNION
+        select REDELEGATE_SOURCE_VALIDATOR_ADDRESS as validator_address, 
+               tx_id,
+               amount/pow(10,6) as undelegate_amt,
+               delegator_address
+        from axelar.gov.fact_staking
+        where action = 'redelegate'
+          and TX_SUCCEEDED = 'TRUE'
+          and block_timestamp::date >= '2022-08-01'
+    ),
+    delegation as (
+        select validator_address,
+               sum(delegate_amt) as delegate_amounts
+        from delegate
+        group by 1
+    ),
+    undelegation as (
+        select validator_address,
+               sum(undelegate_amt) as undelegate_amounts
+        from undelegate
+        group by 1
+    )
+    select ifnull(label, a.validator_address) as "Validator",
+           round(delegate_amounts,1) as "Delegate Amount",
+           round(ifnull(undelegate_amounts,0),1) as "Undelegate Amount",
+           round(("Delegate Amount" - "Undelegate Amount"),1) as "Net Delegate Amount" 
+    from delegation a 
+    left outer join undelegation b on a.validator_address = b.validator_address
+    left outer join axelar.gov.fact_validators c on a.validator_address = c.address
+    order by 4 desc 
+    limit 75
+    """
+    return db.run_query(query, timeout=STATEMENT_TIMEOUTS["net_delegated_per_validator"])
+
+
+# Query builders for the loaders the cost guard checks before running them.
+COST_GUARDED_QUERIES = {
+    "range_summary": range_summary_query,
+    "top_delegators": top_delegators_query,
+    "daily_active_delegators": daily_active_delegators_query,
+}
+
+
+# --- Warehouse Source ---------------------------------------------------------------------------------------------------
+# The data-source interface the dashboard reads through; SnapshotSource in axl_staking.snapshots mirrors it.
+class WarehouseSource:
+    def __init__(self, db, cost_guard=None):
+        self.db = db
+        self.cost_guard = cost_guard or CostGuard(db)
+
+    def over_budget(self, loader, *args):
+        # Reason string when the loader's query for `args` would exceed its scan budget, else None.
+        return self.cost_guard.check(loader, COST_GUARDED_QUERIES[loader](*args))
+
+    def probe_watermark(self):
+        return probe_watermark(self.db)
+
+    def staking_events(self, since=None):
+        return load_staking_events(self.db, since)
+
+    def staking_tail(self, since):
+        return load_staking_tail(self.db, since)
+
+    def daily_active_delegators(self):
+        return load_daily_active_delegators(self.db)
+
+    def range_summary(self, start_date, end_date, approx=False):
+        return load_range_summary(self.db, start_date, end_date, approx)
+
+    def top_delegators(self, start_date, end_date):
+        return load_top_delegators(self.db, start_date, end_date)
+
+    def new_delegators(self):
+        return load_new_delegators(self.db)
+
+    def redelegate_data(self):
+        return get_redelegate_data(self.db)
+
+    def net_delegated_per_validator(self):
+        return get_net_delegated_per_validator(self.db)
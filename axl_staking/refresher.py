@@ -0,0 +1,82 @@
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+# --- Stale-While-Revalidate Refresher -----------------------------------------------------------------------------------
+# Pages render against `served` — the newest watermark whose datasets are already warm. A daemon thread probes the
+# watermark on an interval, warms the default view and the most visited ranges at the new watermark, and only then
+# swaps `served`, so no interactive visitor waits on a cold warehouse query after new data lands. Refreshes are
+# serialised, so visitors arriving during a cold start wait for the one warm-up instead of each running their own. View
+# counts are halved after every refresh and capped at `max_tracked` ranges, so old or one-off ranges fall away.
+class BackgroundRefresher:
+    def __init__(self, probe, warm, default_range, interval_seconds, popular_limit=5, max_tracked=256):
+        self.probe = probe
+        self.warm = warm
+        self.default_range = default_range
+        self.interval_seconds = interval_seconds
+        self.popular_limit = popular_limit
+        self.max_tracked = max_tracked
+        self.served = None
+        self.views = Counter()
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="axl-staking-refresher", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def current(self):
+        # Only the first visitors of a fresh process wait here, all on the same warm-up.
+        if self.served is None:
+            with self.refresh_lock:
+                if self.served is None:
+                    self._refresh()
+        return self.served
+
+    def record_view(self, start_date, end_date):
+        with self.lock:
+            self.views[(start_date, end_date)] += 1
+            if len(self.views) > 2 * self.max_tracked:
+                self.views = Counter(dict(self.views.most_common(self.max_tracked)))
+
+    def _decay_views(self):
+        with self.lock:
+            decayed = Counter({key: count // 2 for key, count in self.views.most_common(self.max_tracked)})
+            self.views = +decayed
+
+    def ranges_to_warm(self):
+        with self.lock:
+            popular = [key for key, _ in self.views.most_common(self.popular_limit)]
+        ranges = [self.default_range]
+        ranges.extend(key for key in popular if key != self.default_range)
+        return ranges
+
+    def refresh_once(self):
+        with self.refresh_lock:
+            return self._refresh()
+
+    def _refresh(self):
+        watermark = self.probe()
+        if self.served is not None and watermark == self.served:
+            return False
+        self.warm(watermark, self.ranges_to_warm())
+        self.served = watermark
+        self._decay_views()
+        return True
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval_seconds):
+            try:
+                self.refresh_once()
+            except Exception:
+                logger.exception("Background refresh failed; keeping watermark %s", self.served)
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOWS = (7, 30, 90)
+# Defaults for the Row 13 split, as the warehouse queries it replaces had them fixed: delegations over the last 61 days,
+# split by whether the delegator first delegated within the last 90.
+SHARE_WINDOW_DAYS = 61
+NEW_STAKER_DAYS = 90
+
+
+def trailing_sums(prefix, window):
+    # Sum over the trailing `window` entries ending at each position, from a prefix sum with a leading zero.
+    end = np.arange(1, len(prefix))
+    return prefix[end] - prefix[np.maximum(end - window, 0)]
+
+
+# --- Rolling Windows ----------------------------------------------------------------------------------------------------
+# Daily delegated, undelegated and net amounts and staking messages on a consecutive day grid, each held as a prefix sum,
+# so any trailing window over every day is one vectorised difference: O(days) whatever the window. Unique delegators
+# come from the cube's per-day HyperLogLog sketches merged over the same windows (see DaySketches.rolling_counts).
+class RollingWindows:
+    def __init__(self, days, prefixes, sketches):
+        self.days = days
+        self.prefixes = prefixes
+        self.sketches = sketches
+
+    @classmethod
+    def from_cube(cls, cube):
+        daily = cube.rollup("day", actions=["delegate", "undelegate"])
+        if daily.empty:
+            return cls(pd.DatetimeIndex([]), {}, cube.sketches("delegate"))
+        days = pd.date_range(daily["Period"].min(), cube.last_day, freq="D")
+        wide = daily.pivot(index="Period", columns="Action", values=["Amount", "Events"]).reindex(days).fillna(0)
+        delegated, undelegated = (
+            wide[("Amount", action)].values if ("Amount", action) in wide.columns else np.zeros(len(days))
+            for action in ["delegate", "undelegate"]
+        )
+        series = {
+            "Delegated": delegated,
+            "Undelegated": undelegated,
+            "Net Flow": delegated - undelegated,
+            "Messages": wide["Events"].sum(axis=1).values,
+        }
+        prefixes = {name: np.concatenate([[0.0], np.cumsum(values)]) for name, values in series.items()}
+        return cls(days, prefixes, cube.sketches("delegate"))
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        return int(self.days.nbytes + sum(prefix.nbytes for prefix in self.prefixes.values()))
+
+    def window(self, window):
+        # Trailing `window`-day totals, the daily moving average of net flow and unique delegators for every day; the
+        # full history is computed once per window and ranges are cut from it with rolling_between.
+        columns = ["Date", "Delegated", "Undelegated", "Net Flow", "Net Flow Avg", "Messages", "Delegators"]
+        if len(self.days) == 0:
+            return pd.DataFrame(columns=columns)
+        sums = {name: trailing_sums(prefix, window) for name, prefix in self.prefixes.items()}
+        return pd.DataFrame({
+            "Date": self.days,
+            "Delegated": sums["Delegated"].round(1),
+            "Undelegated": sums["Undelegated"].round(1),
+            "Net Flow": sums["Net Flow"].round(1),
+            "Net Flow Avg": (sums["Net Flow"] / window).round(1),
+            "Messages": sums["Messages"].astype(np.int64),
+            "Delegators": self.sketches.rolling_counts(self.days, window),
+        }, columns=columns)
+
+
+def rolling_between(rolling, start_date=None, end_date=None):
+    # Days of the range from a full-history window(); windows still reach back before the range start.
+    dates = rolling["Date"].values
+    lo = 0 if start_date is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), "left")
+    hi = len(dates) if end_date is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), "right")
+    return rolling.iloc[lo:hi].reset_index(drop=True)
+
+
+# --- Row13: New vs Active Stakers ---
+# Delegated amount per day over the last `window_days`, split into New Stakers (first delegation within the last
+# `new_days`) and Active Stakers, counted back from the cube's last day.
+def daily_share_delegated_amount(cube, window_days=SHARE_WINDOW_DAYS, new_days=NEW_STAKER_DAYS):
+    if cube.last_day is None:
+        return pd.DataFrame(columns=["Date", "Type", "Delegated Amount"])
+    first = cube.first_seen("Delegator", actions=["delegate"])
+    new = first.index[first >= cube.last_day - pd.Timedelta(days=new_days)].astype(str)
+    facts = cube.slice(cube.last_day - pd.Timedelta(days=window_days), actions=["delegate"])
+    kind = np.where(facts["Delegator"].astype(str).isin(new), "New Stakers", "Active Stakers")
+    return (
+        facts.groupby([facts["Day"].rename("Date"), pd.Series(kind, index=facts.index, name="Type")])["Amount"].sum()
+        .rename("Delegated Amount")
+        .reset_index()
+    )
+
+
+def share_amount(daily_share):
+    return daily_share.groupby("Type", as_index=False)["Delegated Amount"].sum().round({"Delegated Amount": 0})
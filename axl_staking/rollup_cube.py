@@ -0,0 +1,147 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from axl_staking.hll import DaySketches
+
+
+# --- Size Buckets -------------------------------------------------------------------------------------------------------
+SIZE_BUCKET_EDGES = [-np.inf, 10, 100, 1000, 10000, 100000, 1000000, np.inf]
+SIZE_BUCKET_LABELS = ["<= 10 Axl", "10-100 Axl", "100-1k Axl", "1k-10k Axl", "10k-100k Axl", "100k-1m Axl", "> 1m Axl"]
+
+GRAIN_FREQ = {"day": "D", "week": "W-SUN", "month": "M"}
+GRAIN_DAYS = {"day": 1, "week": 7, "month": 30.44}
+GRAIN_LABELS = {"day": "Daily", "week": "Weekly", "month": "Monthly"}
+MAX_TREND_POINTS = 120
+
+
+def size_bucket(amounts):
+    return pd.cut(amounts, bins=SIZE_BUCKET_EDGES, labels=SIZE_BUCKET_LABELS, right=True)
+
+
+def choose_grain(start_date, end_date, max_points=MAX_TREND_POINTS):
+    # Finest grain that keeps a trend chart over the range within `max_points` points.
+    span_days = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1
+    for grain in ["day", "week", "month"]:
+        if span_days / GRAIN_DAYS[grain] <= max_points:
+            return grain
+    return "month"
+
+
+def period_start(days, grain):
+    if grain == "day":
+        return days
+    return days.dt.to_period(GRAIN_FREQ[grain]).dt.start_time
+
+
+# --- Rollup Cube --------------------------------------------------------------------------------------------------------
+# Daily staking ledger keyed by day x action x validator x source validator. The delegator address is kept as the leaf
+# of every cell so distinct-user counts stay exact when cells are merged into weeks, months or whole ranges. Size buckets
+# are a property of an address's total over a range, so they are assigned per range (datasets.range_summary), not here.
+class RollupCube:
+    CATEGORIES = ["Action", "Validator", "Source Validator", "Delegator"]
+
+    def __init__(self, events=None, facts=None):
+        if facts is None:
+            facts = events.copy()
+            facts["Day"] = pd.to_datetime(facts["Date"])
+            facts = facts.drop(columns=["Date"])
+        for col in self.CATEGORIES:
+            facts[col] = facts[col].fillna("").astype("category")
+        self.facts = facts.sort_values("Day", kind="stable").reset_index(drop=True)
+        self._days = self.facts["Day"].values
+        self._sketches = {}
+        self._sketches_lock = threading.Lock()
+
+    @property
+    def last_day(self):
+        return self.facts["Day"].iloc[-1] if len(self.facts) else None
+
+    def with_tail(self, since, events):
+        # New cube with every day from `since` onwards replaced by `events`; the current cube is left untouched so
+        # readers on other sessions never see a half-applied update.
+        keep = self.facts[self.facts["Day"] < pd.Timestamp(since)]
+        fresh = RollupCube(events).facts
+        combined = pd.concat(
+            [keep.astype({col: str for col in self.CATEGORIES}), fresh.astype({col: str for col in self.CATEGORIES})],
+            ignore_index=True,
+        )
+        cube = RollupCube(facts=combined)
+        # Daily sketches before `since` are still valid; only the tail days are re-sketched.
+        for action, sketches in list(self._sketches.items()):
+            fresh_days = cube.facts[(cube.facts["Day"] >= pd.Timestamp(since)) & (cube.facts["Action"] == action)]
+            cube._sketches[action] = sketches.before(since).extend(
+                DaySketches.from_frame(fresh_days, "Day", "Delegator")
+            )
+        return cube
+
+    def __len__(self):
+        return len(self.facts)
+
+    @property
+    def nbytes(self):
+        return int(self.facts.memory_usage(deep=True, index=True).sum()) + sum(
+            sketches.nbytes for sketches in list(self._sketches.values())
+        )
+
+    def sketches(self, action):
+        # Per-day HyperLogLog sketches of the delegators behind `action`, built on first use.
+        sketches = self._sketches.get(action)
+        if sketches is None:
+            with self._sketches_lock:
+                sketches = self._sketches.get(action)
+                if sketches is None:
+                    sketches = DaySketches.from_frame(self.facts[self.facts["Action"] == action], "Day", "Delegator")
+                    self._sketches[action] = sketches
+        return sketches
+
+    def slice(self, start_date=None, end_date=None, actions=None):
+        lo = 0 if start_date is None else np.searchsorted(self._days, np.datetime64(pd.Timestamp(start_date)), "left")
+        hi = len(self._days) if end_date is None else np.searchsorted(
+            self._days, np.datetime64(pd.Timestamp(end_date)), "right"
+        )
+        facts = self.facts.iloc[lo:hi]
+        if actions is not None:
+            facts = facts[facts["Action"].isin(actions)]
+        return facts
+
+    @staticmethod
+    def reduce(facts, keys, users=True):
+        grouped = facts.groupby(keys, observed=True, sort=True)
+        measures = dict(Amount=("Amount", "sum"), Txns=("Txns", "sum"), Events=("Events", "sum"))
+        if users:
+            measures["Users"] = ("Delegator", "nunique")
+        out = grouped.agg(**measures)
+        out["Avg Amount"] = out["Amount"] / out["Events"]
+        return out.reset_index()
+
+    def rollup(self, grain, start_date=None, end_date=None, by=("Action",), actions=None, approx=False):
+        # approx: distinct users per period and action from the daily sketches instead of an exact nunique.
+        approx = approx and tuple(by) == ("Action",)
+        facts = self.slice(start_date, end_date, actions)
+        facts = facts.assign(Period=period_start(facts["Day"], grain))
+        out = self.reduce(facts, ["Period", *by], users=not approx)
+        if approx:
+            out["Users"] = 0
+            for action in out["Action"].unique():
+                counts = self.sketches(action).count_by_period(
+                    lambda days: period_start(days, grain), start_date, end_date
+                )
+                rows = out["Action"] == action
+                out.loc[rows, "Users"] = out.loc[rows, "Period"].map(counts).fillna(0).astype("int64").values
+            out = out[["Period", "Action", "Amount", "Txns", "Events", "Users", "Avg Amount"]]
+        return out
+
+    def first_seen(self, key, actions=None):
+        facts = self.facts if actions is None else self.facts[self.facts["Action"].isin(actions)]
+        return facts.groupby(key, observed=True)["Day"].min()
+
+    def new_by_period(self, key, grain, start_date=None, end_date=None, actions=None):
+        # Count of keys (delegators, validators) whose first appearance falls in each period of the range.
+        first = self.first_seen(key, actions)
+        lo = pd.Timestamp(start_date) if start_date is not None else first.min()
+        hi = pd.Timestamp(end_date) if end_date is not None else first.max()
+        first = first[(first >= lo) & (first <= hi)]
+        counts = period_start(first.reset_index(drop=True), grain).value_counts().sort_index()
+        return pd.DataFrame({"Period": counts.index, "New": counts.values, "Cumulative": counts.values.cumsum()})
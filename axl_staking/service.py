@@ -0,0 +1,306 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from axl_staking import cohorts, datasets, rolling
+from axl_staking.datasets import DEFAULT_END_DATE, DEFAULT_START_DATE
+from axl_staking.export import DEFAULT_CHUNK_ROWS, iter_export
+from axl_staking.freshness import WATERMARK_LOOKBACK_DAYS, WATERMARK_TTL_SECONDS, StakingStore
+from axl_staking.live import LiveTail
+from axl_staking.memory import MemoryAccountant, deep_nbytes
+from axl_staking.refresher import BackgroundRefresher
+from axl_staking.rollup_cube import RollupCube
+from axl_staking.unbonding import UnbondingQueue
+from axl_staking.validators import ValidatorStakeMatrix, stake_concentration, validator_lifecycle
+
+
+# --- Staking Service ----------------------------------------------------------------------------------------------------
+# One per process: the data source, the incrementally synced rollup cube, the prefix-sum indexes, the byte-budgeted
+# loader cache and the background refresher, behind one method per dataset. The Streamlit page and the metrics API both
+# read through it. Every method defaults to the served watermark, so results only turn over once new data is warm.
+class StakingService:
+    def __init__(self, source, accountant=None, default_range=(DEFAULT_START_DATE, DEFAULT_END_DATE),
+                 refresh_interval_seconds=WATERMARK_TTL_SECONDS):
+        self.source = source
+        self.accountant = accountant or MemoryAccountant.from_env()
+        self.store = StakingStore(source.staking_events, RollupCube)
+        self._indexes = OrderedDict()
+        self._indexes_lock = threading.Lock()
+        self._live = None
+        self._notices = OrderedDict()
+        self._stake_matrices = OrderedDict()
+        self._unbonding = OrderedDict()
+        self.accountant.track("Rollup cubes", lambda: sum(cube.nbytes for cube in list(self.store.cubes.values())))
+        self.accountant.track("Stake indexes", lambda: sum(deep_nbytes(ix) for ix in list(self._indexes.values())))
+        self.accountant.track("Validator stake", lambda: sum(m.nbytes for m in list(self._stake_matrices.values())))
+
+        memoize = self.accountant.memoize
+        self._range_summary = memoize(self._load_range_summary, name="range_summary")
+        self._local_range_summary = memoize(
+            lambda start_date, end_date, watermark: datasets.range_summary(self.cube(watermark), start_date, end_date),
+            name="local_range_summary")
+        self._top_delegators = memoize(self._load_top_delegators, name="top_delegators")
+        self._daily_active_delegators = memoize(self._load_daily_active_delegators, name="daily_active_delegators")
+        self._new_delegators = memoize(lambda watermark: source.new_delegators(), name="new_delegators")
+        self._rolling_windows = memoize(
+            lambda watermark: rolling.RollingWindows.from_cube(self.cube(watermark)), name="rolling_windows")
+        self._rolling_window = memoize(
+            lambda window, watermark: self._rolling_windows(watermark).window(window), name="rolling_window")
+        self._daily_share_delegated_amount = memoize(
+            lambda window_days, new_days, watermark: rolling.daily_share_delegated_amount(
+                self.cube(watermark), window_days, new_days),
+            name="daily_share_delegated_amount")
+        self._redelegate_data = memoize(lambda watermark: source.redelegate_data(), name="redelegate_data")
+        self._net_delegated_per_validator = memoize(
+            lambda watermark: source.net_delegated_per_validator(), name="net_delegated_per_validator")
+        self._cohort_retention = memoize(
+            lambda watermark: cohorts.cohort_retention(self.cube(watermark)), name="cohort_retention")
+        self._validator_lifecycle = memoize(
+            lambda grain, watermark: validator_lifecycle(self.validator_stake(grain, watermark)),
+            name="validator_lifecycle")
+
+        self.refresher = BackgroundRefresher(
+            source.probe_watermark,
+            self.warm,
+            default_range=default_range,
+            interval_seconds=refresh_interval_seconds
+        )
+
+    # --- Cost-guarded loaders ---
+    # The heavy warehouse loaders are EXPLAINed first; over budget, the same dataset is computed from the synced daily
+    # ledger instead (transactions summed per day rather than distinct over the range) and a notice is recorded for the
+    # served watermark. A later run of the same loader that fits its budget drops the notice again. A source with no
+    # stored answer for the arguments (snapshots, outside their default range) returns None and the cube answers too.
+    def _degraded(self, watermark, scope, what, reason):
+        with self._indexes_lock:
+            self._notices[watermark, scope, what] = f"{what} come from the pre-aggregated daily ledger: {reason}."
+            self._notices.move_to_end((watermark, scope, what))
+            while len(self._notices) > 256:
+                self._notices.popitem(last=False)
+
+    def _fits(self, watermark, scope, what):
+        # The same loader ran within budget: its earlier notice no longer describes what is shown.
+        with self._indexes_lock:
+            self._notices.pop((watermark, scope, what), None)
+
+    def notices(self, start_date, end_date, watermark=None):
+        watermark = self._watermark(watermark)
+        return [
+            notice for (served, scope, _), notice in list(self._notices.items())
+            if served == watermark and scope in (None, (start_date, end_date))
+        ]
+
+    def _guarded(self, loader, watermark, scope, what, remote, local, *args):
+        reason = self.source.over_budget(loader, *args)
+        if reason:
+            self._degraded(watermark, scope, what, reason)
+            return local()
+        self._fits(watermark, scope, what)
+        result = remote()
+        return local() if result is None else result
+
+    def _load_range_summary(self, start_date, end_date, approx, watermark):
+        return self._guarded(
+            "range_summary", watermark, (start_date, end_date), "Overview, action and holder-size figures",
+            lambda: self.source.range_summary(start_date, end_date, approx),
+            lambda: datasets.range_summary(self.cube(watermark), start_date, end_date),
+            start_date, end_date, approx,
+        )
+
+    def _load_top_delegators(self, start_date, end_date, watermark):
+        return self._guarded(
+            "top_delegators", watermark, (start_date, end_date), "Top delegators",
+            lambda: self.source.top_delegators(start_date, end_date),
+            lambda: datasets.top_delegators(self.cube(watermark), start_date, end_date),
+            start_date, end_date,
+        )
+
+    def _load_daily_active_delegators(self, watermark):
+        return self._guarded(
+            "daily_active_delegators", watermark, None, "Delegator counts",
+            self.source.daily_active_delegators,
+            lambda: datasets.daily_active_delegators(self.cube(watermark)),
+        )
+
+    def start(self):
+        self.refresher.start()
+        return self
+
+    def current_watermark(self):
+        return self.refresher.current()
+
+    def _watermark(self, watermark):
+        return self.current_watermark() if watermark is None else watermark
+
+    def cube(self, watermark=None):
+        return self.store.sync(self._watermark(watermark))
+
+    def stake_indexes(self, watermark=None):
+        watermark = self._watermark(watermark)
+        indexes = self._indexes.get(watermark)
+        if indexes is None:
+            indexes = datasets.build_stake_indexes(self.cube(watermark), self.daily_active_delegators(watermark))
+            with self._indexes_lock:
+                self._indexes[watermark] = indexes
+                while len(self._indexes) > 2:
+                    self._indexes.popitem(last=False)
+        return indexes
+
+    def warm(self, watermark, ranges):
+        self.cube(watermark)
+        self.stake_indexes(watermark)
+        self.new_delegators(watermark)
+        self.daily_share_delegated_amount(watermark=watermark)
+        for window in rolling.ROLLING_WINDOWS:
+            self._rolling_window(window, watermark)
+        self.redelegate_data(watermark)
+        self.net_delegated_per_validator(watermark)
+        for range_start, range_end in ranges:
+            self.range_summary(range_start, range_end, True, watermark)
+            self.top_delegators(range_start, range_end, watermark)
+
+    # --- Row1, Row4, Row8: KPIs ---
+    def share_of_staked_tokens(self, start_date, end_date, watermark=None):
+        flow_index, _ = self.stake_indexes(watermark)
+        return datasets.share_of_staked_tokens(flow_index, start_date, end_date)
+
+    def current_net_staked(self, start_date, end_date, watermark=None):
+        flow_index, _ = self.stake_indexes(watermark)
+        return datasets.current_net_staked(flow_index, start_date, end_date)
+
+    def current_number_of_delegators(self, start_date, end_date, watermark=None):
+        _, delegators_index = self.stake_indexes(watermark)
+        return datasets.current_number_of_delegators(delegators_index, end_date)
+
+    # --- Range datasets ---
+    def monthly_share_data(self, start_date, end_date, grain="month", watermark=None):
+        return datasets.monthly_share_data(self.cube(watermark), start_date, end_date, grain)
+
+    def range_summary(self, start_date, end_date, approx=False, watermark=None):
+        # Rows 3, 7 and 10 share this one query (or one local pass) per range.
+        return self._range_summary(start_date, end_date, approx, self._watermark(watermark))
+
+    def range_comparison(self, start_date, end_date, compare_start, compare_end, watermark=None):
+        # Both periods from the synced cube's per-address pass, exact and without a warehouse query, so the comparison
+        # period costs one local groupby rather than another set of loaders.
+        watermark = self._watermark(watermark)
+        return datasets.range_comparison(
+            self._local_range_summary(start_date, end_date, watermark),
+            self._local_range_summary(compare_start, compare_end, watermark),
+        )
+
+    def delegate_kpis(self, start_date, end_date, approx=False, watermark=None):
+        return datasets.delegate_kpis(self.range_summary(start_date, end_date, approx, watermark))
+
+    def monthly_delegation_data(self, start_date, end_date, grain="month", approx=False, watermark=None):
+        return datasets.monthly_delegation_data(self.cube(watermark), start_date, end_date, grain, approx)
+
+    def action_summary_by_type(self, start_date, end_date, approx=False, watermark=None):
+        return datasets.action_summary_by_type(self.range_summary(start_date, end_date, approx, watermark))
+
+    def top_delegators(self, start_date, end_date, watermark=None):
+        return self._top_delegators(start_date, end_date, self._watermark(watermark))
+
+    def users_breakdown(self, start_date, end_date, approx=False, watermark=None):
+        return datasets.users_breakdown(self.range_summary(start_date, end_date, approx, watermark))
+
+    def monthly_new_delegators(self, start_date, end_date, grain="month", watermark=None):
+        return datasets.monthly_new_delegators(self.cube(watermark), start_date, end_date, grain)
+
+    def rolling_flows(self, window, start_date, end_date, watermark=None):
+        # Trailing `window`-day flows for each day of the range: the full history is computed once per window and
+        # watermark, and each range is a slice of it.
+        return rolling.rolling_between(self._rolling_window(window, self._watermark(watermark)), start_date, end_date)
+
+    def cohort_retention(self, start_date, end_date, watermark=None):
+        # The full cohort matrix is computed once per watermark; ranges only pick their cohorts from it.
+        return cohorts.retention_between(self._cohort_retention(self._watermark(watermark)), start_date, end_date)
+
+    def monthly_new_validators(self, start_date, end_date, grain="month", watermark=None):
+        lifecycle = self._validator_lifecycle(grain, self._watermark(watermark))
+        return datasets.monthly_new_validators(lifecycle, start_date, end_date, grain)
+
+    def validator_stake(self, grain="month", watermark=None):
+        # Validators x period-end stake over the whole history; ranges are column slices of it. A new watermark extends
+        # the newest matrix of the grain over the cube's re-fetched tail instead of replaying every event again.
+        watermark = self._watermark(watermark)
+        matrix = self._stake_matrices.get((grain, watermark))
+        if matrix is None:
+            cube = self.cube(watermark)
+            previous = next((m for (g, _), m in reversed(list(self._stake_matrices.items())) if g == grain), None)
+            if previous is None or previous.last_day is None or cube.last_day is None:
+                matrix = ValidatorStakeMatrix.from_cube(cube, grain)
+            else:
+                since = min(previous.last_day, cube.last_day) - pd.Timedelta(days=WATERMARK_LOOKBACK_DAYS)
+                matrix = previous.with_tail(cube, since)
+            with self._indexes_lock:
+                self._stake_matrices[grain, watermark] = matrix
+                while len(self._stake_matrices) > 6:
+                    self._stake_matrices.popitem(last=False)
+        return matrix
+
+    def stake_concentration(self, start_date, end_date, grain="month", watermark=None):
+        return stake_concentration(self.validator_stake(grain, watermark).between(start_date, end_date))
+
+    # --- Unbonding ---
+    def unbonding_queue(self, watermark=None):
+        # In-flight undelegations as of the watermark's last event day; a new watermark carries the newest queue
+        # forward over the cube's re-fetched tail.
+        watermark = self._watermark(watermark)
+        queue = self._unbonding.get(watermark)
+        if queue is None:
+            cube = self.cube(watermark)
+            previous = next(reversed(list(self._unbonding.values())), None)
+            if previous is None or previous.now is None or cube.last_day is None:
+                queue = UnbondingQueue.from_cube(cube)
+            else:
+                since = min(previous.now, cube.last_day) - pd.Timedelta(days=WATERMARK_LOOKBACK_DAYS)
+                queue = previous.with_tail(cube, since)
+            with self._indexes_lock:
+                self._unbonding[watermark] = queue
+                while len(self._unbonding) > 2:
+                    self._unbonding.popitem(last=False)
+        return queue
+
+    def unlock_schedule(self, watermark=None):
+        return self.unbonding_queue(watermark).schedule()
+
+    # --- Full-history datasets ---
+    def daily_active_delegators(self, watermark=None):
+        return self._daily_active_delegators(self._watermark(watermark))
+
+    def new_delegators(self, watermark=None):
+        return self._new_delegators(self._watermark(watermark))
+
+    def daily_share_delegated_amount(self, window_days=rolling.SHARE_WINDOW_DAYS, new_days=rolling.NEW_STAKER_DAYS,
+                                     watermark=None):
+        return self._daily_share_delegated_amount(window_days, new_days, self._watermark(watermark))
+
+    def share_amount(self, window_days=rolling.SHARE_WINDOW_DAYS, new_days=rolling.NEW_STAKER_DAYS, watermark=None):
+        return rolling.share_amount(self.daily_share_delegated_amount(window_days, new_days, watermark))
+
+    def redelegate_data(self, watermark=None):
+        return self._redelegate_data(self._watermark(watermark))
+
+    def net_delegated_per_validator(self, watermark=None):
+        return self._net_delegated_per_validator(self._watermark(watermark))
+
+    # --- Live tail ---
+    def live_tail(self):
+        # Seeded from the cube at the served watermark on first use, then only moved forward by its own polls.
+        if self._live is None:
+            with self._indexes_lock:
+                if self._live is None:
+                    self._live = LiveTail(self.source.staking_tail, self.cube(self.current_watermark()))
+        return self._live
+
+    # --- Bulk export ---
+    def export(self, name, start_date, end_date, watermark=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        # Chunks streamed from the warehouse when it can, else cut from the synced cube; never cached.
+        return iter_export(
+            name, start_date, end_date,
+            db=getattr(self.source, "db", None),
+            cube=lambda: self.cube(watermark),
+            chunk_rows=chunk_rows,
+        )
@@ -0,0 +1,140 @@
+import glob
+import hashlib
+import logging
+import os
+import re
+import stat
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process coalescing
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_DIR_ENV = "AXL_STAKING_SINGLE_FLIGHT_DIR"
+MAX_SHARED_BYTES = 64 * 2**20
+
+
+def normalize_sql(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def flight_key(sql, params=None):
+    payload = normalize_sql(sql) + "\x00" + repr(params)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def private_dir(path):
+    # Creates `path` with mode 0700, or accepts an existing one only if it is a real directory owned by this user and
+    # closed to everyone else; shared results are loaded from it, so nobody else may be able to plant files there.
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise PermissionError(f"{path} must be a directory owned by uid {os.getuid()} with mode 0700")
+    return path
+
+
+def default_dir(environ=None):
+    environ = os.environ if environ is None else environ
+    return environ.get(SINGLE_FLIGHT_DIR_ENV) or os.path.join(
+        tempfile.gettempdir(), f"axl_staking_single_flight-{os.getuid()}"
+    )
+
+
+# --- Single-Flight ------------------------------------------------------------------------------------------------------
+# Identical queries (same normalized SQL and bind parameters) from different worker processes on the host share one
+# execution: the leader holds an flock on a per-key lock file and leaves its result next to it as an Arrow IPC file for
+# `result_ttl_seconds`, so processes that queued on the lock pick it up instead of querying again. Within a process the
+# QueryRunner already coalesces callers onto one future, so only one thread per key ever gets here.
+#
+# The directory must be private to this user (see private_dir); if it is not, cross-process sharing is switched off.
+# Lock files are removed by whoever releases them last and expired results on the next write, so the directory only
+# holds what is in flight or fresh. Callers pass shared=False for queries no other process will repeat (the live tail)
+# or too big to be worth a disk round trip (the full ledger), and results over `max_shared_bytes` are never written.
+class SingleFlight:
+    def __init__(self, lock_dir=None, result_ttl_seconds=30, max_shared_bytes=MAX_SHARED_BYTES):
+        self.lock_dir = None
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_shared_bytes = max_shared_bytes
+        if fcntl is not None:
+            path = lock_dir or default_dir()
+            try:
+                self.lock_dir = private_dir(path)
+            except OSError as e:
+                logger.warning("Cross-process query sharing disabled: %s", e)
+
+    def do(self, sql, params, fn, shared=True):
+        if not shared or self.lock_dir is None:
+            return fn()
+        return self._run_across_processes(flight_key(sql, params), fn)
+
+    def _run_across_processes(self, key, fn):
+        lock_path = os.path.join(self.lock_dir, f"{key}.lock")
+        result_path = os.path.join(self.lock_dir, f"{key}.arrow")
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                shared = self._read_fresh(result_path)
+                if shared is not None:
+                    return shared
+                result = fn()
+                self._write(result_path, result)
+                return result
+            finally:
+                # A process still queued on this file gets the lock next and reads the result; one arriving after the
+                # unlink starts a new lock file and finds the result the same way.
+                try:
+                    os.unlink(lock_path)
+                except OSError:
+                    pass
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _expired(self, path):
+        return time.time() - os.path.getmtime(path) > self.result_ttl_seconds
+
+    def _read_fresh(self, path):
+        import pyarrow as pa
+
+        try:
+            if self._expired(path):
+                os.unlink(path)
+                return None
+            with pa.memory_map(path, "r") as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+    def _write(self, path, result):
+        import pandas as pd
+        import pyarrow as pa
+
+        self._remove_expired()
+        if not isinstance(result, pd.DataFrame):
+            return
+        if int(result.memory_usage(deep=True, index=True).sum()) > self.max_shared_bytes:
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            table = pa.Table.from_pandas(result, preserve_index=True)
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException):
+            logger.warning("Could not share a query result across processes", exc_info=True)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remove_expired(self):
+        for path in glob.glob(os.path.join(self.lock_dir, "*.arrow")):
+            try:
+                if self._expired(path):
+                    os.unlink(path)
+            except OSError:
+                pass
@@ -0,0 +1,72 @@
+import argparse
+import logging
+import os
+import time
+
+import pandas as pd
+
+from axl_staking import datasets
+from axl_staking.queries import WarehouseSource
+from axl_staking.snapshots import prune_snapshots, write_snapshot
+from axl_staking.fixtures import load_snowflake_secrets, warehouse_from_env
+
+logger = logging.getLogger(__name__)
+
+
+# --- Headless Snapshot Builder ------------------------------------------------------------------------------------------
+# Runs the warehouse loaders behind the dashboard through the same query layer as the Streamlit page and writes their
+# results as one versioned Parquet snapshot. Everything else the page shows is derived from these in the service (the
+# rollup cube is rebuilt from the daily events), so only what SnapshotSource reads is stored. Meant to run on a
+# schedule, e.g.:
+#
+#   python -m axl_staking.snapshot_builder --out snapshots --keep 5
+#
+# and the dashboard started with AXL_STAKING_SNAPSHOT_DIR=snapshots to serve it without warehouse credentials.
+def build_datasets(source, start_date, end_date):
+    return {
+        # Full-history daily aggregates, enough to recompute any range locally.
+        "staking_events": source.staking_events(),
+        "daily_active_delegators": source.daily_active_delegators(),
+        # Range-independent warehouse datasets.
+        "new_delegators": source.new_delegators(),
+        "redelegate_data": source.redelegate_data(),
+        "net_delegated_per_validator": source.net_delegated_per_validator(),
+        # Default-range warehouse datasets; other ranges are recomputed from the daily events.
+        "range_summary": source.range_summary(start_date, end_date),
+        "top_delegators": source.top_delegators(start_date, end_date),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute every AXL staking dashboard dataset into a Parquet snapshot.")
+    parser.add_argument("--out", default="snapshots", help="Snapshot root directory.")
+    parser.add_argument("--secrets", default=os.path.join(".streamlit", "secrets.toml"),
+                        help="Streamlit secrets file holding the [snowflake] section.")
+    parser.add_argument("--start", default=str(datasets.DEFAULT_START_DATE), help="Default range start (YYYY-MM-DD).")
+    parser.add_argument("--end", default=str(datasets.DEFAULT_END_DATE), help="Default range end (YYYY-MM-DD).")
+    parser.add_argument("--keep", type=int, default=5, help="Number of snapshot versions to keep.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args(argv)
+    start_date = pd.to_datetime(args.start).date()
+    end_date = pd.to_datetime(args.end).date()
+
+    db = warehouse_from_env(lambda: load_snowflake_secrets(args.secrets))
+    source = WarehouseSource(db)
+    try:
+        started = time.perf_counter()
+        watermark = source.probe_watermark()
+        frames = build_datasets(source, start_date, end_date)
+        os.makedirs(args.out, exist_ok=True)
+        version = write_snapshot(args.out, frames, watermark, (start_date, end_date))
+        prune_snapshots(args.out, args.keep)
+    finally:
+        db.close()
+    logger.info("Wrote snapshot %s (%d datasets) in %.1fs", version, len(frames), time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
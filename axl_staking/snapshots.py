@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from axl_staking.queries import TAIL_COLUMNS
+
+SNAPSHOT_FORMAT_VERSION = 1
+LATEST_POINTER = "LATEST"
+MANIFEST_FILE = "manifest.json"
+
+
+# --- Versioned Parquet Snapshots ----------------------------------------------------------------------------------------
+# <root>/<version>/<dataset>.parquet plus a manifest per version, and <root>/LATEST naming the newest complete version.
+# The pointer is replaced atomically only after every file of a version has been written.
+def write_snapshot(root, frames, watermark, default_range):
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    version_dir = os.path.join(root, version)
+    os.makedirs(version_dir, exist_ok=True)
+    datasets = {}
+    for name, df in frames.items():
+        df.to_parquet(os.path.join(version_dir, f"{name}.parquet"))
+        datasets[name] = {"rows": int(len(df)), "columns": [str(col) for col in df.columns]}
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "watermark": list(watermark),
+        "default_range": [str(default_range[0]), str(default_range[1])],
+        "datasets": datasets,
+    }
+    with open(os.path.join(version_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    pointer_tmp = os.path.join(root, f"{LATEST_POINTER}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(root, LATEST_POINTER))
+    return version
+
+
+def latest_version(root):
+    try:
+        with open(os.path.join(root, LATEST_POINTER)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def read_manifest(root, version):
+    with open(os.path.join(root, version, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def read_dataset(root, version, name):
+    return pd.read_parquet(os.path.join(root, version, f"{name}.parquet"))
+
+
+def prune_snapshots(root, keep):
+    current = latest_version(root)
+    versions = sorted(
+        entry for entry in os.listdir(root)
+        if os.path.isfile(os.path.join(root, entry, MANIFEST_FILE))
+    )
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version != current:
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+
+
+# --- Snapshot Source ----------------------------------------------------------------------------------------------------
+# Serves the same methods as the warehouse source from the newest snapshot, so the dashboard can run without ever
+# opening a Snowflake connection. Range datasets are stored for the snapshot's default range; for any other range the
+# loaders return None and StakingService computes it from its own synced cube. The daily ledger is only read to build
+# that cube, so it is not kept here as well.
+class SnapshotSource:
+    def __init__(self, root):
+        self.root = root
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _version(self):
+        version = latest_version(self.root)
+        if version is None:
+            raise FileNotFoundError(f"No snapshot found under {self.root}; run the snapshot builder first.")
+        return version
+
+    def _read(self, name):
+        version = self._version()
+        key = (version, name)
+        if key not in self._frames:
+            with self._lock:
+                self._frames = {k: v for k, v in self._frames.items() if k[0] == version}
+                self._frames[key] = read_dataset(self.root, version, name)
+        return self._frames[key].copy()
+
+    def _default_range(self):
+        return tuple(read_manifest(self.root, self._version())["default_range"])
+
+    def over_budget(self, loader, *args):
+        # Everything is read from local files; nothing to guard.
+        return None
+
+    def probe_watermark(self):
+        return tuple(read_manifest(self.root, self._version())["watermark"])
+
+    def staking_events(self, since=None):
+        events = read_dataset(self.root, self._version(), "staking_events")
+        if since is not None:
+            events = events[pd.to_datetime(events["Date"]) >= pd.Timestamp(since)]
+        return events
+
+    def staking_tail(self, since):
+        # A snapshot never grows; live mode just sees no new events.
+        return pd.DataFrame(columns=TAIL_COLUMNS)
+
+    def daily_active_delegators(self):
+        return self._read("daily_active_delegators")
+
+    def range_summary(self, start_date, end_date, approx=False):
+        if (str(start_date), str(end_date)) == self._default_range():
+            return self._read("range_summary")
+        return None
+
+    def top_delegators(self, start_date, end_date):
+        if (str(start_date), str(end_date)) == self._default_range():
+            return self._read("top_delegators")
+        return None
+
+    def new_delegators(self):
+        return self._read("new_delegators")
+
+    def redelegate_data(self):
+        return self._read("redelegate_data")
+
+    def net_delegated_per_validator(self):
+        return self._read("net_delegated_per_validator")
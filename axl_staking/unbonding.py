@@ -0,0 +1,94 @@
+import heapq
+import itertools
+import threading
+
+import pandas as pd
+
+# Axelar's staking unbonding_time: undelegated AXL is released this long after the undelegation.
+UNBONDING_DAYS = 7
+
+
+# --- Unbonding Queue ----------------------------------------------------------------------------------------------------
+# Undelegations still inside the unbonding period, in a min-heap keyed by maturity. Advancing the clock pops what has
+# matured, so the in-flight total and the unlock schedule only ever touch the (at most UNBONDING_DAYS worth of) entries
+# still queued. Seeding reads just the last UNBONDING_DAYS of the cube; anything older has already been released.
+class UnbondingQueue:
+    def __init__(self, unbonding_days=UNBONDING_DAYS):
+        self.unbonding_days = unbonding_days
+        self.period = pd.Timedelta(days=unbonding_days)
+        self.unbonding = 0.0
+        self.released = 0.0
+        self.now = None
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_cube(cls, cube, unbonding_days=UNBONDING_DAYS, until=None):
+        # Queue as of the end of `until` (default: the cube's last day), from the undelegations of the period before it.
+        queue = cls(unbonding_days)
+        until = cube.last_day if until is None else pd.Timestamp(until)
+        if until is not None:
+            queue._push_facts(cube.slice(until - queue.period, until, actions=["undelegate"]))
+            queue.advance(until)
+        return queue
+
+    def with_tail(self, cube, since):
+        # Queue for `cube`, whose days from `since` onwards replace the ones this queue was fed; this one is untouched.
+        queue = UnbondingQueue(self.unbonding_days)
+        with self._lock:
+            kept = [entry for entry in self._heap if entry[2] < pd.Timestamp(since)]
+        for _, _, started, amount, delegator, validator in kept:
+            queue.push(started, amount, delegator, validator)
+        queue._push_facts(cube.slice(since, actions=["undelegate"]))
+        if cube.last_day is not None:
+            queue.advance(cube.last_day)
+        return queue
+
+    def _push_facts(self, facts):
+        rows = facts[["Day", "Amount", "Delegator", "Validator"]].itertuples(index=False, name=None)
+        for day, amount, delegator, validator in rows:
+            self.push(day, amount, str(delegator), str(validator))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, started, amount, delegator="", validator=""):
+        started = pd.Timestamp(started)
+        maturity = started + self.period
+        with self._lock:
+            if self.now is not None and maturity <= self.now:
+                self.released += float(amount)
+                return
+            heapq.heappush(self._heap, (maturity, next(self._seq), started, float(amount), delegator, validator))
+            self.unbonding += float(amount)
+
+    def advance(self, now):
+        # Releases every entry matured by `now`; returns the amount released.
+        now = pd.Timestamp(now)
+        released = 0.0
+        with self._lock:
+            if self.now is not None and now < self.now:
+                return 0.0
+            self.now = now
+            while self._heap and self._heap[0][0] <= now:
+                released += heapq.heappop(self._heap)[3]
+            self.unbonding -= released
+            self.released += released
+        return released
+
+    def schedule(self):
+        # Projected unlocks per day from the current clock to the last maturity still queued.
+        with self._lock:
+            entries = [(maturity, amount) for maturity, _, _, amount, _, _ in self._heap]
+        if not entries:
+            return pd.DataFrame(columns=["Date", "Unlock Amount", "Cumulative Unlock"])
+        df = pd.DataFrame(entries, columns=["Maturity", "Amount"])
+        daily = df.groupby(df["Maturity"].dt.floor("D"))["Amount"].sum()
+        days = pd.date_range(daily.index.min(), daily.index.max(), freq="D")
+        daily = daily.reindex(days, fill_value=0.0)
+        return pd.DataFrame({
+            "Date": days,
+            "Unlock Amount": daily.round(1).values,
+            "Cumulative Unlock": daily.cumsum().round(1).values,
+        })
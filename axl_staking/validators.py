@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from axl_staking.rollup_cube import GRAIN_FREQ, period_start
+
+NAKAMOTO_THRESHOLDS = (1 / 3, 2 / 3)
+TOP_N = 10
+# Axelar's staking max_validators; validators must also hold at least MIN_BONDED_STAKE AXL to count as bonded.
+MAX_VALIDATORS = 75
+MIN_BONDED_STAKE = 1.0
+
+
+def stake_deltas(cube, since=None):
+    # (day, validator, signed amount) for every stake movement: delegations and redelegations in, undelegations and
+    # redelegations out of their source validator, as in get_net_delegated_per_validator.
+    facts = cube.slice(since, actions=["delegate", "undelegate", "redelegate"])
+    action = facts["Action"].astype(str).to_numpy()
+    amount = facts["Amount"].to_numpy(dtype=np.float64)
+    source = facts["Source Validator"].astype(str).to_numpy()
+    moved_out = (action == "redelegate") & (source != "")
+    days = np.concatenate([facts["Day"].to_numpy(), facts["Day"].to_numpy()[moved_out]])
+    validators = np.concatenate([facts["Validator"].astype(str).to_numpy(), source[moved_out]])
+    signed = np.concatenate([np.where(action == "undelegate", -amount, amount), -amount[moved_out]])
+    return days, validators, signed
+
+
+# --- Validator Stake Matrix ---------------------------------------------------------------------------------------------
+# Delegated stake of every validator at the end of every period (validators x periods), built in one pass: the signed
+# stake movements are scattered into their (validator, period) cells and summed cumulatively along the periods. A date
+# range is then a column slice, so metrics over it need no further pass over the events. A newer cube only re-scatters
+# the periods from its re-fetched tail onwards, on top of the stake carried into them.
+class ValidatorStakeMatrix:
+    def __init__(self, validators, periods, stake, grain="month", last_day=None):
+        self.validators = np.asarray(validators, dtype=object)
+        self.periods = pd.DatetimeIndex(periods)
+        self.stake = stake
+        self.grain = grain
+        self.last_day = last_day
+
+    @classmethod
+    def from_cube(cls, cube, grain="month"):
+        return cls([], [], np.zeros((0, 0)), grain)._accumulate(cube, 0, None)
+
+    def with_tail(self, cube, since):
+        # Matrix for `cube`, whose days from `since` onwards may differ from the ones this matrix was built from.
+        if len(self.periods) == 0:
+            return ValidatorStakeMatrix.from_cube(cube, self.grain)
+        start = period_start(pd.Series([pd.Timestamp(since)]), self.grain).iloc[0]
+        keep = int(np.searchsorted(self.periods.values, np.datetime64(start), "left"))
+        return self._accumulate(cube, keep, self.periods[keep] if keep < len(self.periods) else start)
+
+    def _accumulate(self, cube, keep, since):
+        # Keeps the first `keep` periods and rebuilds the rest from the cube's movements on or after `since`.
+        days, validators, signed = stake_deltas(cube, since)
+        if keep == 0 and len(days) == 0:
+            return ValidatorStakeMatrix([], [], np.zeros((0, 0)), self.grain, cube.last_day)
+        starts = period_start(pd.Series(days, dtype="datetime64[ns]"), self.grain)
+        first = self.periods[0] if keep else starts.min()
+        periods = pd.period_range(first, cube.last_day, freq=GRAIN_FREQ[self.grain]).start_time
+        names = np.union1d(self.validators, np.unique(validators)) if len(self.validators) else np.unique(validators)
+        carried = np.zeros((len(names), keep), dtype=np.float64)
+        carried[np.searchsorted(names, self.validators)] = self.stake[:, :keep]
+        changes = np.zeros((len(names), len(periods) - keep), dtype=np.float64)
+        column = np.searchsorted(periods.values, starts.values, side="right") - 1 - keep
+        np.add.at(changes, (np.searchsorted(names, validators), column), signed)
+        if keep:
+            changes[:, 0] += carried[:, -1]
+        stake = np.concatenate([carried, np.cumsum(changes, axis=1)], axis=1)
+        return ValidatorStakeMatrix(names, periods, stake, self.grain, cube.last_day)
+
+    def __len__(self):
+        return len(self.periods)
+
+    @property
+    def nbytes(self):
+        return int(self.stake.nbytes + self.validators.nbytes + self.periods.nbytes)
+
+    def between(self, start_date, end_date):
+        # Periods of the range; the first one is the period containing `start_date`.
+        start = period_start(pd.Series([pd.Timestamp(start_date)]), self.grain).iloc[0]
+        lo = np.searchsorted(self.periods.values, np.datetime64(start), "left")
+        hi = np.searchsorted(self.periods.values, np.datetime64(pd.Timestamp(end_date)), "right")
+        return ValidatorStakeMatrix(
+            self.validators, self.periods[lo:hi], self.stake[:, lo:hi], self.grain, self.last_day
+        )
+
+
+# --- Stake Concentration ------------------------------------------------------------------------------------------------
+# Every period at once: one sort of the stake matrix along the validator axis, then cumulative sums. Negative stake
+# (undelegations of bonds made before the data starts) is treated as zero.
+def nakamoto_coefficients(ranked, totals, thresholds=NAKAMOTO_THRESHOLDS):
+    # Fewest validators whose combined stake exceeds each threshold share of the total; `ranked` is sorted descending.
+    shares = np.cumsum(ranked, axis=0) / np.where(totals > 0, totals, 1)
+    return [np.where(totals > 0, (shares <= threshold).sum(axis=0) + 1, 0) for threshold in thresholds]
+
+
+def gini_coefficients(ranked, totals):
+    # Gini over the validators holding stake in each period; `ranked` is sorted descending.
+    holders = (ranked > 0).sum(axis=0)
+    rank_from_bottom = holders[None, :] - np.arange(len(ranked))[:, None]
+    weighted = (rank_from_bottom * ranked).sum(axis=0)
+    n = np.maximum(holders, 1)
+    gini = 2 * weighted / (n * np.where(totals > 0, totals, 1)) - (n + 1) / n
+    return np.where(holders > 1, gini, 0.0)
+
+
+def stake_concentration(matrix, top_n=TOP_N):
+    columns = ["Period", "Validators With Stake", "Nakamoto 33%", "Nakamoto 67%", "Gini", f"Top {top_n} Share"]
+    if len(matrix) == 0 or len(matrix.validators) == 0:
+        return pd.DataFrame(columns=columns)
+    ranked = -np.sort(-np.clip(matrix.stake, 0, None), axis=0)
+    totals = ranked.sum(axis=0)
+    nakamoto_33, nakamoto_67 = nakamoto_coefficients(ranked, totals)
+    return pd.DataFrame({
+        "Period": matrix.periods,
+        "Validators With Stake": (ranked > 0).sum(axis=0),
+        "Nakamoto 33%": nakamoto_33,
+        "Nakamoto 67%": nakamoto_67,
+        "Gini": gini_coefficients(ranked, totals).round(4),
+        f"Top {top_n} Share": np.where(totals > 0, ranked[:top_n].sum(axis=0) / np.where(totals > 0, totals, 1), 0.0),
+    }, columns=columns)
+
+
+# --- Active Validator Set -----------------------------------------------------------------------------------------------
+# At every period end the active set is the top `max_validators` validators by stake among those holding at least
+# `min_stake`, as the chain's end-block selection does. Ranks for all periods come from one argsort along the validator
+# axis; entries and exits are the set differences with the previous period, and a validator is new the first period it
+# enters the set.
+def active_sets(matrix, max_validators=MAX_VALIDATORS, min_stake=MIN_BONDED_STAKE):
+    order = np.argsort(-matrix.stake, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(len(order))[:, None].repeat(order.shape[1], axis=1), axis=0)
+    active = matrix.stake >= min_stake
+    if max_validators is not None:
+        active &= ranks < max_validators
+    return active
+
+
+def validator_lifecycle(matrix, max_validators=MAX_VALIDATORS, min_stake=MIN_BONDED_STAKE):
+    columns = ["Period", "Active Validators", "Entered", "Exited", "New Validators"]
+    if len(matrix) == 0 or len(matrix.validators) == 0:
+        return pd.DataFrame(columns=columns)
+    active = active_sets(matrix, max_validators, min_stake)
+    before = np.concatenate([np.zeros((len(active), 1), dtype=bool), active[:, :-1]], axis=1)
+    ever = np.maximum.accumulate(before, axis=1)
+    return pd.DataFrame({
+        "Period": matrix.periods,
+        "Active Validators": active.sum(axis=0),
+        "Entered": (active & ~before).sum(axis=0),
+        "Exited": (before & ~active).sum(axis=0),
+        "New Validators": (active & ~ever).sum(axis=0),
+    }, columns=columns)
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from axl_staking import datasets
+from axl_staking.memory import MemoryAccountant
+from axl_staking.queries import TAIL_COLUMNS
+from axl_staking.rollup_cube import RollupCube
+from axl_staking.service import StakingService
+
+EVENT_COLUMNS = ["Date", "Action", "Validator", "Source Validator", "Delegator", "Amount", "Txns", "Events"]
+
+
+def staking_events(rows):
+    # Daily events frame as load_staking_events returns it, from (date, action, delegator, amount[, validator[, source]])
+    # rows: one transaction and one event each.
+    records = []
+    for date, action, delegator, amount, *rest in rows:
+        validator = rest[0] if rest else "val-a"
+        source = rest[1] if len(rest) > 1 else ""
+        records.append((pd.Timestamp(date), action, validator, source, delegator, float(amount), 1, 1))
+    return pd.DataFrame(records, columns=EVENT_COLUMNS)
+
+
+@pytest.fixture
+def make_events():
+    return staking_events
+
+
+@pytest.fixture
+def make_cube():
+    def build(rows):
+        return RollupCube(staking_events(rows))
+    return build
+
+
+class StubSource:
+    # The WarehouseSource interface over an in-memory events frame: warehouse loaders answer from a cube of the same
+    # events, `reasons` maps a loader to the over-budget reason it reports, and `calls` records every loader run.
+    def __init__(self, rows, watermark=("2024-01-03 12:00:00", 1)):
+        self.events = staking_events(rows)
+        self.watermark = watermark
+        self.reasons = {}
+        self.calls = []
+
+    def _cube(self):
+        return RollupCube(self.events)
+
+    def over_budget(self, loader, *args):
+        return self.reasons.get(loader)
+
+    def probe_watermark(self):
+        self.calls.append("probe_watermark")
+        return self.watermark
+
+    def staking_events(self, since=None):
+        self.calls.append(("staking_events", since))
+        if since is None:
+            return self.events.copy()
+        return self.events[self.events["Date"] >= pd.Timestamp(since)].reset_index(drop=True)
+
+    def staking_tail(self, since):
+        return pd.DataFrame(columns=TAIL_COLUMNS)
+
+    def daily_active_delegators(self):
+        self.calls.append("daily_active_delegators")
+        return datasets.daily_active_delegators(self._cube())
+
+    def range_summary(self, start_date, end_date, approx=False):
+        self.calls.append(("range_summary", start_date, end_date))
+        return datasets.range_summary(self._cube(), start_date, end_date)
+
+    def top_delegators(self, start_date, end_date):
+        self.calls.append(("top_delegators", start_date, end_date))
+        return datasets.top_delegators(self._cube(), start_date, end_date)
+
+    def new_delegators(self):
+        return pd.DataFrame([{"Total Number of New Delegators": 0, "Avg Number of Daily Delegators": 0}])
+
+    def redelegate_data(self):
+        return pd.DataFrame(columns=["Validator", "Redelegate Amount", "Avg Amount", "Transactions"])
+
+    def net_delegated_per_validator(self):
+        net = self.events.assign(Amount=self.events["Amount"].where(self.events["Action"] != "undelegate",
+                                                                    -self.events["Amount"]))
+        return (net.groupby("Validator", as_index=False)["Amount"].sum()
+                .rename(columns={"Amount": "Net Delegate Amount"}))
+
+
+@pytest.fixture
+def make_service():
+    def build(rows, **kwargs):
+        return StakingService(StubSource(rows, **kwargs), accountant=MemoryAccountant(256 * 2**20))
+    return build
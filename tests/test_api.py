@@ -0,0 +1,109 @@
+import gzip
+import http.client
+import json
+import threading
+
+import pytest
+
+from axl_staking import api
+from axl_staking.api import accepts_gzip, etag_matches, make_server
+
+ROWS = [
+    ("2024-01-01", "delegate", "alice", 100),
+    ("2024-01-02", "delegate", "bob", 40),
+    ("2024-01-03", "undelegate", "alice", 30),
+    ("2024-01-03", "delegate", "carol", 10),
+]
+TOP = "/v1/datasets/top_delegators?start=2024-01-01&end=2024-01-03"
+
+
+def test_etag_matches():
+    assert not etag_matches(None, '"abc"')
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"xyz", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"xyz"', '"abc"')
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip(None)
+    assert not accepts_gzip("deflate, br")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("br, *;q=0.0")
+
+
+@pytest.fixture
+def get(make_service):
+    server = make_server(make_service(ROWS), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def request(path, **headers):
+        conn = http.client.HTTPConnection(*server.server_address, timeout=30)
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return response, body
+
+    yield request
+    server.shutdown()
+    server.server_close()
+
+
+def test_dataset_is_served_with_an_etag_and_revalidated(get):
+    response, body = get(TOP)
+
+    assert response.status == 200
+    assert response.getheader("X-Data-Watermark") == "2024-01-03 12:00:00"
+    rows = json.loads(body)["rows"]
+    assert [row["Delegator Address"] for row in rows] == ["alice", "bob", "carol"]
+    assert [row["Net Delegated"] for row in rows] == [70.0, 40.0, 10.0]
+
+    etag = response.getheader("ETag")
+    response, body = get(TOP, **{"If-None-Match": f'"other", {etag}'})
+    assert response.status == 304 and body == b""
+    assert get(TOP + "&limit=5", **{"If-None-Match": etag})[0].status == 200
+
+
+def test_limit_and_offset_page_the_rows(get):
+    response, body = get(TOP + "&limit=1&offset=1")
+
+    assert response.status == 200
+    assert [row["Delegator Address"] for row in json.loads(body)["rows"]] == ["bob"]
+    assert json.loads(get(TOP + "&offset=5")[1])["rows"] == []
+
+
+@pytest.mark.parametrize("query, message", [
+    ("limit=ten", "invalid limit: 'ten'"),
+    ("offset=-1", "offset must be >= 0"),
+    ("format=xml", "unsupported format: 'xml'"),
+    ("start=2024-02-01&end=2024-01-31", "start must not be after end"),
+    ("start=yesterday-ish", "invalid start date: 'yesterday-ish'"),
+])
+def test_bad_parameters_are_rejected(get, query, message):
+    response, body = get("/v1/datasets/top_delegators?" + query)
+
+    assert response.status == 400
+    assert json.loads(body) == {"error": message}
+
+
+def test_unknown_dataset_is_not_found(get):
+    response, body = get("/v1/datasets/nope")
+
+    assert response.status == 404
+    assert json.loads(body) == {"error": "unknown dataset"}
+
+
+def test_bodies_are_gzipped_only_when_accepted(get, monkeypatch):
+    monkeypatch.setattr(api, "GZIP_MIN_BYTES", 0)
+
+    response, body = get(TOP, **{"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert len(json.loads(gzip.decompress(body))["rows"]) == 3
+
+    response, body = get(TOP, **{"Accept-Encoding": "gzip;q=0, identity"})
+    assert response.getheader("Content-Encoding") is None
+    assert len(json.loads(body)["rows"]) == 3
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from axl_staking.cohorts import cohort_retention, retention_between
+
+EVENTS = [
+    ("2024-01-05", "delegate", "alice", 10),
+    ("2024-01-20", "delegate", "bob", 5),
+    ("2024-01-25", "undelegate", "zed", 3),  # never delegated in the data: in no cohort
+    ("2024-02-03", "undelegate", "bob", 5),
+    ("2024-02-10", "delegate", "carol", 7),
+    ("2024-03-15", "undelegate", "alice", 4),
+    ("2024-03-20", "delegate", "bob", 2),
+]
+
+
+@pytest.fixture
+def retention(make_cube):
+    return cohort_retention(make_cube(EVENTS))
+
+
+def test_cohorts_follow_month_end_balances(retention):
+    # Cohort = month of first delegation; retained = net delegated balance of at least 0.001 AXL at the month end.
+    assert list(retention["Cohort"]) == list(pd.to_datetime(["2024-01-01"] * 3 + ["2024-02-01"] * 2))
+    assert retention["Months Since"].tolist() == [0, 1, 2, 0, 1]
+    assert retention["Cohort Size"].tolist() == [2, 2, 2, 1, 1]
+    # January: alice and bob; bob is out in February after undelegating everything and back in March.
+    assert retention["Retained"].tolist() == [2, 1, 2, 1, 1]
+    assert retention["Retention"].tolist() == pytest.approx([1.0, 0.5, 1.0, 1.0, 1.0])
+    assert retention["Retained Stake"].tolist() == pytest.approx([15.0, 10.0, 8.0, 7.0, 7.0])
+
+
+def test_threshold(make_cube):
+    retention = cohort_retention(make_cube(EVENTS), threshold=6)
+
+    # Only balances of at least 6 AXL count: alice (10, 10, 6) and carol (7, 7).
+    assert retention["Retained"].tolist() == [1, 1, 1, 1, 1]
+    assert retention["Retained Stake"].tolist() == pytest.approx([10.0, 10.0, 6.0, 7.0, 7.0])
+
+
+def test_retention_between_picks_cohorts_of_the_range(retention):
+    february = retention_between(retention, "2024-02-15", "2024-03-31")
+
+    assert list(february["Cohort"].unique()) == [pd.Timestamp("2024-02-01")]
+    assert february["Months Since"].tolist() == [0, 1]
+
+
+def test_no_delegations(make_cube):
+    assert cohort_retention(make_cube([("2024-01-01", "claim", "alice", 1)])).empty
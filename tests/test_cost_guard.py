@@ -0,0 +1,80 @@
+import json
+
+import pandas as pd
+import pytest
+
+from axl_staking.cost_guard import CostBudget, CostGuard
+from axl_staking.lifecycle import QueryCancelled
+
+ROWS = [
+    ("2024-01-01", "delegate", "alice", 100),
+    ("2024-01-02", "delegate", "bob", 40),
+    ("2024-01-03", "undelegate", "alice", 30),
+]
+
+
+class PlanDb:
+    def __init__(self, bytes_assigned=0, error=None):
+        self.bytes_assigned = bytes_assigned
+        self.error = error
+        self.queries = []
+
+    def run_query(self, query, timeout=None):
+        self.queries.append(query)
+        if self.error is not None:
+            raise self.error
+        stats = {"partitionsTotal": 10, "partitionsAssigned": 1, "bytesAssigned": self.bytes_assigned}
+        return pd.DataFrame({"plan": [json.dumps({"GlobalStats": stats})]})
+
+
+def guard(db, **kwargs):
+    return CostGuard(db, budgets={"range_summary": CostBudget(max_bytes=100, max_partitions=100)}, **kwargs)
+
+
+def test_estimates_are_cached_per_query_text():
+    db = PlanDb(bytes_assigned=500)
+    cost_guard = guard(db)
+
+    assert "would scan" in cost_guard.check("range_summary", "SELECT 1")
+    assert "would scan" in cost_guard.check("range_summary", "SELECT  1")
+    assert len(db.queries) == 1
+    assert cost_guard.check("top_delegators", "SELECT 2") is None
+
+
+def test_cancelled_explain_propagates():
+    cost_guard = guard(PlanDb(error=QueryCancelled("superseded")))
+
+    with pytest.raises(QueryCancelled):
+        cost_guard.check("range_summary", "SELECT 1")
+
+
+def test_failed_explain_fails_open_and_is_not_retried_within_its_ttl():
+    db = PlanDb(error=RuntimeError("no fixture"))
+    cost_guard = guard(db)
+
+    assert cost_guard.check("range_summary", "SELECT 1") is None
+    assert cost_guard.check("range_summary", "SELECT 1") is None
+    assert len(db.queries) == 1
+
+    expired = guard(db, failure_ttl_seconds=0)
+    expired.check("range_summary", "SELECT 1")
+    expired.check("range_summary", "SELECT 1")
+    assert len(db.queries) == 3
+
+
+def test_notices_follow_the_watermark_and_clear_once_within_budget(make_service):
+    service = make_service(ROWS)
+    start, end = pd.Timestamp("2024-01-01").date(), pd.Timestamp("2024-01-03").date()
+    old, new = ("2024-01-03 12:00:00", 1), ("2024-01-03 18:00:00", 2)
+
+    service.source.reasons["top_delegators"] = "too big"
+    service.top_delegators(start, end, watermark=old)
+    assert service.notices(start, end, watermark=old) == ["Top delegators come from the pre-aggregated daily ledger: "
+                                                          "too big."]
+    assert service.notices(start, end, watermark=new) == []
+
+    # The next run of the same loader fits its budget, so the notice no longer describes what is shown.
+    service.source.reasons.clear()
+    service._top_delegators.clear()
+    service.top_delegators(start, end, watermark=old)
+    assert service.notices(start, end, watermark=old) == []
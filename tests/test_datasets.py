@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from axl_staking import datasets
+
+EVENTS = [
+    ("2024-01-01", "delegate", "alice", 5),
+    ("2024-01-02", "delegate", "alice", 50),
+    ("2024-01-02", "delegate", "bob", 500),
+    ("2024-01-03", "undelegate", "bob", 20),
+    ("2024-02-01", "delegate", "carol", 8),
+    ("2024-02-02", "delegate", "alice", 2000),
+]
+
+
+@pytest.fixture
+def cube(make_cube):
+    return make_cube(EVENTS)
+
+
+def summary_rows(summary):
+    rows = summary.assign(Bucket=summary["Bucket"].fillna(""))
+    return {
+        (action, bucket): [amount, txns, events, users]
+        for action, bucket, amount, txns, events, users in rows.itertuples(index=False, name=None)
+    }
+
+
+def test_range_summary_matches_the_grouping_sets_query(cube):
+    # Per action: SUM(amount), SUM(txns), SUM(events), COUNT(DISTINCT delegator); per action x size bucket of each
+    # address's total over the range: the same measures over the addresses in the bucket.
+    assert summary_rows(datasets.range_summary(cube, "2024-01-01", "2024-01-31")) == {
+        ("delegate", ""): [555.0, 3, 3, 2],
+        ("delegate", "10-100 Axl"): [55.0, 2, 2, 1],
+        ("delegate", "100-1k Axl"): [500.0, 1, 1, 1],
+        ("undelegate", ""): [20.0, 1, 1, 1],
+        ("undelegate", "10-100 Axl"): [20.0, 1, 1, 1],
+    }
+    assert summary_rows(datasets.range_summary(cube, "2024-02-01", "2024-02-29")) == {
+        ("delegate", ""): [2008.0, 2, 2, 2],
+        ("delegate", "<= 10 Axl"): [8.0, 1, 1, 1],
+        ("delegate", "1k-10k Axl"): [2000.0, 1, 1, 1],
+    }
+
+
+def test_range_comparison(cube):
+    february = datasets.range_summary(cube, "2024-02-01", "2024-02-29")
+    january = datasets.range_summary(cube, "2024-01-01", "2024-01-31")
+    comparison = datasets.range_comparison(february, january)
+
+    assert list(zip(comparison["Action"], comparison["Bucket"])) == [
+        ("delegate", ""),
+        ("delegate", "10-100 Axl"),
+        ("delegate", "100-1k Axl"),
+        ("delegate", "1k-10k Axl"),
+        ("delegate", "<= 10 Axl"),
+        ("undelegate", ""),
+        ("undelegate", "10-100 Axl"),
+    ]
+    assert comparison["Amount"].tolist() == [2008.0, 0.0, 0.0, 2000.0, 8.0, 0.0, 0.0]
+    assert comparison["Amount (Compare)"].tolist() == [555.0, 55.0, 500.0, 0.0, 0.0, 20.0, 20.0]
+    assert comparison["Amount Change"].tolist() == [1453.0, -55.0, -500.0, 2000.0, 8.0, -20.0, -20.0]
+    # No percentage where the comparison period has nothing to compare against.
+    np.testing.assert_array_equal(
+        comparison["Amount % Change"].to_numpy(dtype=float), [261.8, -100.0, -100.0, np.nan, np.nan, -100.0, -100.0]
+    )
+    np.testing.assert_array_equal(comparison.loc[0, ["Txns", "Txns (Compare)", "Txns Change", "Txns % Change"]]
+                                  .to_numpy(dtype=float), [2.0, 3.0, -1.0, -33.3])
+    assert comparison.loc[0, ["Users Change", "Users % Change"]].tolist() == [0, 0.0]
+
+
+def test_range_comparison_with_itself_is_unchanged(cube):
+    january = datasets.range_summary(cube, "2024-01-01", "2024-01-31")
+    comparison = datasets.range_comparison(january, january)
+
+    for measure in datasets.COMPARED_MEASURES:
+        assert (comparison[f"{measure} Change"] == 0).all()
+        assert (comparison[f"{measure} % Change"] == 0).all()
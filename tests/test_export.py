@@ -0,0 +1,115 @@
+import io
+
+import pandas as pd
+import pytest
+
+from axl_staking import datasets
+from axl_staking.export import _DrainSink, _day_chunks, _local_delegators, iter_encoded, iter_export
+
+EVENTS = [
+    ("2024-01-01", "delegate", "alice", 5),
+    ("2024-01-02", "delegate", "alice", 50),
+    ("2024-01-02", "delegate", "bob", 500),
+    ("2024-01-02", "delegate", "dave", 70, "val-b"),
+    ("2024-01-02", "delegate", "erin", 3, "val-b"),
+    ("2024-01-03", "undelegate", "bob", 20),
+    ("2024-01-03", "redelegate", "frank", 9, "val-b", "val-a"),
+    ("2024-02-01", "delegate", "carol", 8),
+    ("2024-02-02", "delegate", "alice", 2000),
+    ("2024-02-02", "undelegate", "dave", 70, "val-b"),
+]
+
+
+@pytest.fixture
+def cube(make_cube):
+    return make_cube(EVENTS)
+
+
+def test_top_delegators_rank_net_totals(cube):
+    top = datasets.top_delegators(cube, "2024-01-01", "2024-02-29", limit=2)
+
+    assert top.index.tolist() == [1, 2]
+    assert top["Delegator Address"].tolist() == ["alice", "bob"]
+    assert top["Net Delegated"].tolist() == [2055.0, 480.0]
+    assert top[["Delegate Messages", "Undelegate Messages"]].values.tolist() == [[3, 0], [1, 1]]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 4, 100])
+def test_delegator_batches_concatenate_to_the_unchunked_totals(cube, chunk_rows):
+    batches = list(_local_delegators(cube, "2024-01-01", "2024-02-29", chunk_rows))
+    expected = datasets.delegator_totals(cube.slice("2024-01-01", "2024-02-29", actions=["delegate", "undelegate"]))
+
+    assert all(len(batch) <= chunk_rows for batch in batches)
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), expected.reset_index(drop=True))
+    # Without a limit the export holds every row of the top-delegators table.
+    top = datasets.top_delegators(cube, "2024-01-01", "2024-02-29")
+    assert sorted(top["Delegator Address"]) == expected["Delegator Address"].tolist()
+
+
+def test_delegator_batches_skip_addresses_outside_the_range(cube):
+    batches = list(_local_delegators(cube, "2024-02-01", "2024-02-29", 2))
+
+    assert [batch["Delegator Address"].tolist() for batch in batches] == [["alice"], ["carol"]]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 100])
+def test_day_chunks_never_split_a_day(cube, chunk_rows):
+    facts = cube.slice()
+    chunks = list(_day_chunks(facts, chunk_rows))
+
+    pd.testing.assert_frame_equal(pd.concat(chunks), facts)
+    for before, after in zip(chunks, chunks[1:]):
+        assert before["Day"].max() < after["Day"].min()
+    # A chunk only runs past `chunk_rows` to finish the day it is in.
+    for chunk in chunks:
+        assert len(chunk) <= chunk_rows or chunk["Day"].iloc[chunk_rows - 1] == chunk["Day"].iloc[-1]
+
+
+@pytest.mark.parametrize("name", ["validator_ledger", "events"])
+def test_local_chunks_concatenate_to_the_unchunked_export(cube, name):
+    chunked = pd.concat(iter_export(name, "2024-01-01", "2024-02-29", cube=cube, chunk_rows=2), ignore_index=True)
+    whole = pd.concat(iter_export(name, "2024-01-01", "2024-02-29", cube=cube, chunk_rows=1000), ignore_index=True)
+
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_csv_header_is_written_once(cube):
+    blocks = list(iter_encoded(iter_export("events", "2024-01-01", "2024-02-29", cube=cube, chunk_rows=2), "csv"))
+    text = b"".join(blocks).decode()
+
+    assert len(blocks) > 1
+    assert text.count("Date,Action") == 1
+    assert len(pd.read_csv(io.StringIO(text))) == len(EVENTS)
+
+
+def test_drain_sink_keeps_the_absolute_position():
+    sink = _DrainSink()
+    sink.write(b"abc")
+    assert sink.drain() == b"abc"
+    sink.write(memoryview(b"de"))
+
+    assert sink.tell() == 5
+    assert sink.drain() == b"de" and sink.drain() == b""
+
+
+def test_parquet_is_encoded_one_chunk_at_a_time(cube):
+    pq = pytest.importorskip("pyarrow.parquet")
+    consumed = []
+
+    def chunks():
+        for chunk in iter_export("events", "2024-01-01", "2024-02-29", cube=cube, chunk_rows=2):
+            consumed.append(len(chunk))
+            yield chunk
+
+    blocks = iter_encoded(chunks(), "parquet")
+    first = next(blocks)
+    # The first row group is out before the second chunk is cut from the cube.
+    assert first and len(consumed) == 1
+    data = first + b"".join(blocks)
+    assert len(consumed) > 2
+
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == len(EVENTS)
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == len(consumed)
+    whole = pd.concat(iter_export("events", "2024-01-01", "2024-02-29", cube=cube), ignore_index=True)
+    pd.testing.assert_frame_equal(table.to_pandas(), whole)
@@ -0,0 +1,77 @@
+import datetime
+
+import pandas as pd
+
+from axl_staking.freshness import StakingStore, watermark_from_frame
+from axl_staking.rollup_cube import RollupCube
+
+ROWS = [
+    ("2024-01-01", "delegate", "alice", 100),
+    ("2024-01-05", "delegate", "bob", 40),
+    ("2024-01-08", "undelegate", "alice", 30),
+    ("2024-01-10", "delegate", "carol", 10),
+]
+
+
+class Ledger:
+    # fetch_events over a growing list of rows, recording the `since` of every fetch.
+    def __init__(self, make_events, rows):
+        self.make_events = make_events
+        self.rows = list(rows)
+        self.fetches = []
+
+    def __call__(self, since=None):
+        self.fetches.append(since)
+        events = self.make_events(self.rows)
+        if since is None:
+            return events
+        return events[events["Date"] >= pd.Timestamp(since)].reset_index(drop=True)
+
+
+def test_known_watermark_is_served_without_fetching(make_events):
+    ledger = Ledger(make_events, ROWS)
+    store = StakingStore(ledger, RollupCube)
+
+    cube = store.sync(("2024-01-10 09:00:00", 4))
+    assert store.sync(("2024-01-10 09:00:00", 4)) is cube
+    assert ledger.fetches == [None]
+    assert len(cube) == 4
+
+
+def test_new_watermark_refetches_only_the_lookback_tail(make_events):
+    ledger = Ledger(make_events, ROWS)
+    store = StakingStore(ledger, RollupCube)
+    first = store.sync(("2024-01-10 09:00:00", 4))
+
+    # A late row inside the lookback window and a new day.
+    ledger.rows += [("2024-01-09", "delegate", "dave", 5), ("2024-01-11", "delegate", "erin", 1)]
+    updated = store.sync(("2024-01-11 10:00:00", 5))
+
+    assert ledger.fetches == [None, datetime.date(2024, 1, 7)]
+    assert updated is not first and len(first) == 4
+    rebuilt = RollupCube(make_events(ledger.rows))
+    assert updated.last_day == pd.Timestamp("2024-01-11")
+    pd.testing.assert_frame_equal(updated.rollup("day").astype({"Action": str}),
+                                  rebuilt.rollup("day").astype({"Action": str}))
+
+
+def test_only_the_newest_cubes_are_kept(make_events):
+    ledger = Ledger(make_events, ROWS)
+    store = StakingStore(ledger, RollupCube, keep=2)
+    watermarks = [("2024-01-10 09:00:00", 4), ("2024-01-10 10:00:00", 4), ("2024-01-10 11:00:00", 4)]
+    cubes = [store.sync(watermark) for watermark in watermarks]
+
+    assert list(store.cubes) == watermarks[1:]
+    assert store.latest is cubes[-1]
+    # An evicted watermark is rebuilt from the newest cube's tail, not the full history.
+    store.sync(watermarks[0])
+    assert ledger.fetches == [None] + [datetime.date(2024, 1, 7)] * 3
+    assert list(store.cubes) == [watermarks[2], watermarks[0]]
+
+
+def test_watermark_from_frame():
+    frame = pd.DataFrame({"Watermark": [pd.Timestamp("2024-01-10 09:00:00")], "Recent Rows": [42]})
+
+    assert watermark_from_frame(frame) == ("2024-01-10 09:00:00", 42)
+    assert watermark_from_frame(frame.iloc[:0]) == (None, 0)
+    assert watermark_from_frame(pd.DataFrame({"Watermark": [None], "Recent Rows": [0]})) == (None, 0)
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from axl_staking.hll import DaySketches, hash_values, hll_error
+
+
+def day_frame(days):
+    # {day: [delegators]} as a (Day, Delegator) frame.
+    rows = [(pd.Timestamp(day), delegator) for day, delegators in days.items() for delegator in delegators]
+    return pd.DataFrame(rows, columns=["Day", "Delegator"])
+
+
+DAYS = {
+    "2024-01-01": ["alice", "bob", "carol"],
+    "2024-01-02": ["carol", "dave"],
+    "2024-01-03": ["alice"],
+}
+
+
+def test_range_counts_are_distinct_over_the_merged_days():
+    # COUNT(DISTINCT delegator) WHERE day BETWEEN ...
+    sketches = DaySketches.from_frame(day_frame(DAYS), "Day", "Delegator")
+
+    assert len(sketches) == 3
+    assert sketches.count_between() == 4
+    assert sketches.count_between("2024-01-02", "2024-01-03") == 3
+    assert sketches.count_between("2024-01-02", "2024-01-02") == 2
+    assert sketches.count_between("2023-01-01", "2023-12-31") == 0
+
+
+def test_merging_days_equals_sketching_their_union():
+    frame = day_frame(DAYS)
+    per_day = DaySketches.from_frame(frame, "Day", "Delegator")
+    union = DaySketches.from_frame(frame.assign(Day=pd.Timestamp("2024-01-01")), "Day", "Delegator")
+
+    assert np.array_equal(per_day.registers.max(axis=0), union.registers[0])
+
+
+def test_rolling_counts_over_a_day_grid():
+    sketches = DaySketches.from_frame(day_frame(DAYS), "Day", "Delegator")
+    grid = pd.date_range("2024-01-01", "2024-01-04", freq="D")
+
+    # Two-day windows: {a,b,c}, {a,b,c,d}, {c,d,a}, {a}; 2024-01-04 has no events of its own.
+    assert sketches.rolling_counts(grid, 2).tolist() == [3, 4, 3, 1]
+    assert sketches.rolling_counts(grid, 1).tolist() == [3, 2, 1, 0]
+
+
+def test_count_by_period():
+    frame = day_frame({"2024-01-31": ["alice", "bob"], "2024-02-01": ["bob", "carol"], "2024-02-02": ["dave"]})
+    sketches = DaySketches.from_frame(frame, "Day", "Delegator")
+    counts = sketches.count_by_period(lambda days: days.dt.to_period("M").dt.start_time)
+
+    assert list(pd.DatetimeIndex(counts.index)) == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")]
+    assert counts.tolist() == [2, 3]
+
+
+def test_before_and_extend_split_and_rejoin():
+    sketches = DaySketches.from_frame(day_frame(DAYS), "Day", "Delegator")
+    head = sketches.before("2024-01-02")
+    tail = DaySketches.from_frame(day_frame({day: DAYS[day] for day in ["2024-01-02", "2024-01-03"]}), "Day", "Delegator")
+    rejoined = head.extend(tail)
+
+    assert len(head) == 1
+    assert np.array_equal(rejoined.days, sketches.days)
+    assert np.array_equal(rejoined.registers, sketches.registers)
+
+
+def test_estimate_is_within_the_standard_error_at_scale():
+    # 10 days of 600 delegators each, overlapping by half with the day before.
+    days = {f"2024-01-{day + 1:02d}": [f"addr-{i}" for i in range(day * 300, day * 300 + 600)] for day in range(10)}
+    frame = day_frame(days)
+    sketches = DaySketches.from_frame(frame, "Day", "Delegator")
+
+    exact = frame["Delegator"].nunique()
+    assert exact == 3300
+    assert abs(sketches.count_between() - exact) <= 3 * hll_error() * exact
+    exact_range = frame[frame["Day"].between("2024-01-03", "2024-01-05")]["Delegator"].nunique()
+    assert abs(sketches.count_between("2024-01-03", "2024-01-05") - exact_range) <= 3 * hll_error() * exact_range
+
+
+def test_categorical_and_string_values_hash_alike():
+    values = pd.Series(["alice", "bob", "alice", "carol"])
+
+    assert np.array_equal(hash_values(values.astype("category")), hash_values(values))
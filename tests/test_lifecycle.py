@@ -0,0 +1,147 @@
+import contextvars
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from axl_staking.lifecycle import QueryCancelled, QueryRegistry, QueryRunner, throttled
+
+
+def begin(registry, session, generation, checkpoint=None):
+    # Each rerun runs in its own context, as each Streamlit script run does.
+    context = contextvars.copy_context()
+    context.run(registry.begin, session, generation, checkpoint)
+    return context
+
+
+def running(registry, key, *scopes):
+    cancelled = []
+    for scope in scopes:
+        registry._join(key, scope)
+    registry.start(key, lambda: cancelled.append(key))
+    return cancelled
+
+
+def test_superseded_rerun_cancels_its_query():
+    registry = QueryRegistry()
+    cancelled = running(registry, "q", ("s1", 1))
+
+    assert cancelled == []
+    begin(registry, "s1", 2)
+    assert cancelled == ["q"]
+    assert registry.is_cancelled("q")
+    assert registry.cancelled_count == 1
+
+
+def test_query_shared_with_a_current_rerun_keeps_running():
+    registry = QueryRegistry()
+    cancelled = running(registry, "q", ("s1", 1), ("s2", 1))
+
+    begin(registry, "s1", 2)
+    assert cancelled == []
+    # Once the other session stops waiting, nobody current is left.
+    registry._leave("q", ("s2", 1))
+    assert cancelled == ["q"]
+
+
+def test_unscoped_waiters_are_permanent_interest():
+    registry = QueryRegistry()
+    cancelled = running(registry, "q", ("s1", 1), None)
+
+    begin(registry, "s1", 2)
+    registry._leave("q", ("s1", 1))
+    assert cancelled == []
+
+
+def test_query_started_after_its_rerun_was_superseded():
+    registry = QueryRegistry()
+    begin(registry, "s1", 2)
+    cancelled = running(registry, "q", ("s1", 1))
+
+    assert cancelled == ["q"]
+    registry.finish("q")
+    assert not registry.is_cancelled("q")
+
+
+def test_runner_cancels_a_query_nobody_current_waits_on():
+    registry = QueryRegistry()
+    runner = QueryRunner(registry, max_workers=2)
+    started = threading.Event()
+
+    def query():
+        registry.start("q", lambda: None)
+        started.set()
+        try:
+            while not registry.is_cancelled("q"):
+                time.sleep(0.01)
+            raise QueryCancelled("cancelled")
+        finally:
+            registry.finish("q")
+
+    errors = []
+
+    def rerun():
+        context = begin(registry, "s1", 1)
+        try:
+            context.run(runner.run, "q", query)
+        except QueryCancelled as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=rerun)
+    waiter.start()
+    assert started.wait(5)
+    begin(registry, "s1", 2)
+    waiter.join(5)
+    runner.shutdown()
+
+    assert len(errors) == 1
+    assert registry.cancelled_count == 1
+
+
+def test_runner_shares_one_execution_between_identical_queries():
+    registry = QueryRegistry()
+    runner = QueryRunner(registry, max_workers=2)
+    release = threading.Event()
+    calls = []
+
+    def query():
+        calls.append(1)
+        release.wait(5)
+        return pd.DataFrame({"x": [1, 2]})
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(runner.run("q", query))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    runner.shutdown()
+
+    assert len(calls) == 1
+    assert [result["x"].tolist() for result in results] == [[1, 2]] * 3
+    # Every waiter gets its own copy.
+    assert len({id(result) for result in results}) == 3
+
+
+@pytest.mark.parametrize("generation, live", [(1, False), (2, True), (3, True)])
+def test_live_scopes(generation, live):
+    registry = QueryRegistry()
+    begin(registry, "s1", 2)
+
+    assert registry._live(("s1", generation)) is live
+    assert registry._live(None)
+
+
+def test_throttled_checkpoint_runs_at_most_once_per_interval():
+    calls = []
+    heartbeat = throttled(lambda: calls.append(1), interval_seconds=0.2)
+
+    for _ in range(5):
+        heartbeat()
+    assert len(calls) == 1
+    time.sleep(0.25)
+    heartbeat()
+    assert len(calls) == 2
@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+
+from axl_staking.live import LiveTail
+from axl_staking.queries import TAIL_COLUMNS
+
+
+def tail_source(rows):
+    # fetch_tail over a fixed list of (timestamp, tx id, action, validator, source, delegator, amount) rows, with the
+    # `block_timestamp >= since` filter of load_staking_tail.
+    events = pd.DataFrame(rows, columns=TAIL_COLUMNS).assign(Timestamp=lambda df: pd.to_datetime(df["Timestamp"]))
+    calls = []
+
+    def fetch_tail(since):
+        calls.append(pd.Timestamp(since))
+        return events[events["Timestamp"] >= pd.Timestamp(since)].reset_index(drop=True)
+
+    fetch_tail.calls = calls
+    return fetch_tail
+
+
+@pytest.fixture
+def cube(make_cube):
+    # Two days in the cube; the last one (01-02) is also returned by the tail below.
+    return make_cube([
+        ("2024-01-01", "delegate", "alice", 100, "val-a"),
+        ("2024-01-01", "delegate", "bob", 40, "val-b"),
+        ("2024-01-02", "delegate", "carol", 50, "val-a"),
+        ("2024-01-02", "undelegate", "bob", 10, "val-b"),
+    ])
+
+
+TAIL_ROWS = [
+    # Already in the cube's last day.
+    ("2024-01-02 08:00", "tx1", "delegate", "val-a", "", "carol", 50.0),
+    ("2024-01-02 09:00", "tx2", "undelegate", "val-b", "", "bob", 10.0),
+    # New since the cube was built; two events share the newest timestamp.
+    ("2024-01-02 12:00", "tx3", "delegate", "val-b", "", "dave", 20.0),
+    ("2024-01-02 12:00", "tx4", "redelegate", "val-b", "val-a", "alice", 30.0),
+]
+
+
+def test_seed_stops_before_the_cubes_last_day(cube):
+    live = LiveTail(tail_source(TAIL_ROWS), cube)
+
+    assert live.since == pd.Timestamp("2024-01-02")
+    assert live.net_staked("2024-01-01") == 140.0
+    assert dict(live.balances) == {"alice": 100.0, "bob": 40.0}
+    assert live.unbonding.unbonding == 0.0
+
+
+def test_first_poll_replays_the_last_day_once(cube):
+    fetch_tail = tail_source(TAIL_ROWS)
+    live = LiveTail(fetch_tail, cube)
+
+    # Every event is on the cube's last day: replayed into the totals, none of it live activity.
+    assert live.poll(force=True) == 0
+    assert fetch_tail.calls == [pd.Timestamp("2024-01-02")]
+    # Cube total (100 + 40 + 50 - 10) plus dave's 20; carol and bob's undelegation counted once.
+    assert live.net_staked("2024-01-01") == 200.0
+    assert dict(live.balances) == {"alice": 100.0, "bob": 30.0, "carol": 50.0, "dave": 20.0}
+    assert live.active_delegators == 4
+    assert live.delegators == {"alice", "bob", "carol", "dave"}
+    assert dict(live.validator_net) == {"val-a": 120.0, "val-b": 80.0}
+    assert live.unbonding.unbonding == 10.0
+    assert live.new_delegators == []
+    assert live.validator_changes().empty
+    assert live.events_applied == 0
+    assert live.version == 1
+
+
+def test_events_after_the_last_day_are_live(cube):
+    rows = TAIL_ROWS + [("2024-01-03 09:00", "tx7", "delegate", "val-c", "", "gina", 50.0)]
+    live = LiveTail(tail_source(rows), cube)
+
+    assert live.poll(force=True) == 1
+    assert live.net_staked("2024-01-01") == 250.0
+    assert live.new_delegators == [(pd.Timestamp("2024-01-03 09:00"), "gina")]
+    assert live.validator_changes().values.tolist() == [["val-c", 50.0, 50.0]]
+    assert live.events_applied == 1
+
+
+def test_boundary_events_are_not_reapplied(cube):
+    fetch_tail = tail_source(TAIL_ROWS)
+    live = LiveTail(fetch_tail, cube)
+    live.poll(force=True)
+
+    # The next query starts at the newest timestamp and returns both events at it again.
+    assert live.poll(force=True) == 0
+    assert fetch_tail.calls[-1] == pd.Timestamp("2024-01-02 12:00")
+    assert live.net_staked("2024-01-01") == 200.0
+    assert dict(live.validator_net) == {"val-a": 120.0, "val-b": 80.0}
+    assert live.version == 1
+
+
+def test_new_event_at_the_boundary_timestamp_is_applied(cube):
+    rows = list(TAIL_ROWS)
+    fetch_tail = tail_source(rows)
+    live = LiveTail(fetch_tail, cube)
+    live.poll(force=True)
+
+    live.fetch_tail = tail_source(rows + [("2024-01-02 12:00", "tx5", "delegate", "val-a", "", "erin", 5.0)])
+    # Still the cube's last day, so it is replayed rather than live.
+    assert live.poll(force=True) == 0
+    assert live.version == 2
+    assert live.net_staked("2024-01-01") == 205.0
+    assert live.balances["erin"] == 5.0
+
+
+def test_unbonding_advances_with_event_time(cube):
+    rows = TAIL_ROWS + [("2024-01-09 10:00", "tx6", "delegate", "val-a", "", "alice", 1.0)]
+    live = LiveTail(tail_source(rows), cube)
+    live.poll(force=True)
+
+    # bob's undelegation at 2024-01-02 09:00 matures seven days later, before the newest event.
+    assert live.unbonding.now == pd.Timestamp("2024-01-09 10:00")
+    assert live.unbonding.unbonding == 0.0
+    assert live.unbonding.released == 10.0
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import numpy as np
+
+from axl_staking.lifecycle import QueryCancelled
+from axl_staking.memory import MemoryAccountant
+
+
+def sized(nbytes):
+    return lambda name: np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_lowest_scoring_entry_is_evicted_first():
+    accountant = MemoryAccountant(3000)
+    load = accountant.memoize(sized(1000), name="load")
+    load("a")
+    load("b")
+    load("a")
+    load("a")
+
+    accountant.memoize(sized(1500), name="big")("c")
+
+    # "b" was never hit again, so it saves the least recompute time per byte held.
+    assert sorted(args for _, args in accountant.entries) == [("a",), ("c",)]
+    assert accountant.evictions == 1
+    assert accountant.cached_bytes <= accountant.budget_bytes
+
+
+def test_entry_just_stored_is_never_evicted():
+    accountant = MemoryAccountant(3000)
+    accountant.memoize(sized(1000), name="load")("a")
+
+    huge = accountant.memoize(sized(5000), name="huge")
+    huge("d")
+
+    assert list(accountant.entries) == [("huge", ("d",))]
+    assert huge("d").nbytes == 5000
+
+
+def in_threads(fn, *args):
+    results, errors = {}, {}
+
+    def run(name):
+        try:
+            results[name] = fn(*args)
+        except BaseException as exc:
+            errors[name] = exc
+
+    threads = {name: threading.Thread(target=run, args=(name,)) for name in ("leader", "waiter")}
+    return threads, results, errors
+
+
+def test_concurrent_misses_share_one_call():
+    accountant = MemoryAccountant(2**20)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        started.set()
+        release.wait(5)
+        return [key]
+
+    threads, results, errors = in_threads(accountant.memoize(load, name="load"), "k")
+    threads["leader"].start()
+    assert started.wait(5)
+    threads["waiter"].start()
+    time.sleep(0.3)
+    release.set()
+    for thread in threads.values():
+        thread.join(5)
+
+    assert calls == ["k"]
+    assert results == {"leader": ["k"], "waiter": ["k"]}
+    assert results["leader"] is results["waiter"]
+    assert errors == {} and accountant.inflight == {}
+
+
+def test_waiter_retries_after_the_leader_is_cancelled():
+    accountant = MemoryAccountant(2**20)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise QueryCancelled("superseded")
+        return [key]
+
+    threads, results, errors = in_threads(accountant.memoize(load, name="load"), "k")
+    threads["leader"].start()
+    assert started.wait(5)
+    threads["waiter"].start()
+    time.sleep(0.3)
+    release.set()
+    for thread in threads.values():
+        thread.join(5)
+
+    assert calls == ["k", "k"]
+    assert isinstance(errors["leader"], QueryCancelled)
+    assert results == {"waiter": ["k"]}
+
+
+def test_waiter_shares_an_ordinary_failure():
+    accountant = MemoryAccountant(2**20)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        started.set()
+        release.wait(5)
+        raise ValueError("bad query")
+
+    threads, results, errors = in_threads(accountant.memoize(load, name="load"), "k")
+    threads["leader"].start()
+    assert started.wait(5)
+    threads["waiter"].start()
+    time.sleep(0.3)
+    release.set()
+    for thread in threads.values():
+        thread.join(5)
+
+    assert calls == ["k"]
+    assert isinstance(errors["leader"], ValueError) and isinstance(errors["waiter"], ValueError)
+    assert accountant.entries == {}
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from axl_staking.prefix_index import PrefixIndex
+
+# Daily net flow, deliberately out of order, with a gap on 2024-01-04.
+FLOW = pd.DataFrame({
+    "Date": pd.to_datetime(["2024-01-01", "2024-01-03", "2024-01-02", "2024-01-05"]),
+    "Net Flow": [10.0, 5.0, -4.0, 1.0],
+})
+
+
+def warehouse_sum(start_date, end_date):
+    # SUM(net_flow) WHERE date BETWEEN start_date AND end_date
+    rows = FLOW[(FLOW["Date"] >= pd.Timestamp(start_date)) & (FLOW["Date"] <= pd.Timestamp(end_date))]
+    return float(rows["Net Flow"].sum())
+
+
+def test_as_of_is_the_running_total():
+    index = PrefixIndex.from_frame(FLOW, "Date", "Net Flow")
+
+    assert len(index) == 4
+    assert index.first_day == pd.Timestamp("2024-01-01").date()
+    assert index.last_day == pd.Timestamp("2024-01-05").date()
+    assert index.as_of("2023-12-31") == 0.0
+    assert index.as_of("2024-01-01") == 10.0
+    assert index.as_of("2024-01-02") == 6.0
+    assert index.as_of("2024-01-04") == 11.0
+    assert index.as_of("2024-02-01") == 12.0
+
+
+def test_between_matches_a_range_sum_for_every_range():
+    index = PrefixIndex.from_frame(FLOW, "Date", "Net Flow")
+    days = pd.date_range("2023-12-31", "2024-01-06", freq="D")
+    for start in days:
+        for end in days[days >= start]:
+            assert index.between(start, end) == pytest.approx(warehouse_sum(start, end)), (start, end)
+
+
+def test_count_between_counts_days_with_data():
+    index = PrefixIndex.from_frame(FLOW, "Date", "Net Flow")
+
+    assert index.count_between("2024-01-01", "2024-01-05") == 4
+    assert index.count_between("2024-01-02", "2024-01-04") == 2
+    assert index.count_between("2024-01-04", "2024-01-04") == 0
+    assert index.count_between("2024-02-01", "2024-02-28") == 0
+
+
+def test_from_levels_returns_the_level_as_of_each_day():
+    levels = pd.DataFrame({"Date": pd.to_datetime(["2024-01-04", "2024-01-01", "2024-01-02"]), "Users": [4, 3, 5]})
+    index = PrefixIndex.from_levels(levels, "Date", "Users")
+
+    assert index.as_of("2023-12-31") == 0.0
+    assert index.as_of("2024-01-01") == 3.0
+    assert index.as_of("2024-01-03") == 5.0
+    assert index.as_of("2024-01-10") == 4.0
+
+
+def test_empty_frame():
+    index = PrefixIndex.from_frame(pd.DataFrame(columns=["Date", "Net Flow"]), "Date", "Net Flow")
+
+    assert len(index) == 0
+    assert index.first_day is None
+    assert index.as_of("2024-01-01") == 0.0
+    assert index.between("2024-01-01", "2024-12-31") == 0.0
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from axl_staking.refresher import BackgroundRefresher
+
+DEFAULT = ("2022-01-01", "2025-12-31")
+
+
+class Warehouse:
+    # probe/warm pair: `watermark` is what the next probe sees, `gate` (when set) holds warm() until released.
+    def __init__(self, watermark="w1"):
+        self.watermark = watermark
+        self.warmed = []
+        self.gate = None
+        self.started = threading.Event()
+        self.error = None
+
+    def probe(self):
+        return self.watermark
+
+    def warm(self, watermark, ranges):
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        self.warmed.append((watermark, ranges))
+
+
+def refresher_for(warehouse, **kwargs):
+    return BackgroundRefresher(warehouse.probe, warehouse.warm, DEFAULT, interval_seconds=3600, **kwargs)
+
+
+def test_served_only_moves_once_the_new_watermark_is_warm():
+    warehouse = Warehouse()
+    refresher = refresher_for(warehouse)
+    assert refresher.current() == "w1"
+
+    warehouse.watermark, warehouse.gate = "w2", threading.Event()
+    warehouse.started.clear()
+    thread = threading.Thread(target=refresher.refresh_once)
+    thread.start()
+    assert warehouse.started.wait(5)
+    assert refresher.current() == "w1"
+
+    warehouse.gate.set()
+    thread.join(5)
+    assert refresher.current() == "w2"
+    assert [watermark for watermark, _ in warehouse.warmed] == ["w1", "w2"]
+
+
+def test_failed_warm_keeps_the_served_watermark():
+    warehouse = Warehouse()
+    refresher = refresher_for(warehouse)
+    refresher.current()
+
+    warehouse.watermark, warehouse.error = "w2", RuntimeError("warehouse down")
+    with pytest.raises(RuntimeError):
+        refresher.refresh_once()
+    assert refresher.served == "w1"
+
+    warehouse.error = None
+    assert refresher.refresh_once() is True
+    assert refresher.served == "w2"
+    assert refresher.refresh_once() is False
+
+
+def test_background_loop_survives_a_failed_refresh():
+    warehouse = Warehouse()
+    refresher = BackgroundRefresher(warehouse.probe, warehouse.warm, DEFAULT, interval_seconds=0.01)
+    refresher.current()
+    warehouse.watermark, warehouse.error = "w2", RuntimeError("warehouse down")
+
+    refresher.start()
+    try:
+        time.sleep(0.1)
+        assert refresher.thread.is_alive()
+        assert refresher.served == "w1"
+        warehouse.error = None
+        deadline = time.monotonic() + 5
+        while refresher.served != "w2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert refresher.served == "w2"
+    finally:
+        refresher.stop()
+
+
+def test_cold_start_visitors_share_one_warm_up():
+    warehouse = Warehouse()
+    warehouse.gate = threading.Event()
+    refresher = refresher_for(warehouse)
+    served = []
+    threads = [threading.Thread(target=lambda: served.append(refresher.current())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert warehouse.started.wait(5)
+    warehouse.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert served == ["w1"] * 4
+    assert len(warehouse.warmed) == 1
+
+
+def test_popular_ranges_are_warmed_and_decay():
+    warehouse = Warehouse()
+    refresher = refresher_for(warehouse, popular_limit=2)
+    for _ in range(4):
+        refresher.record_view("2024-01-01", "2024-03-31")
+    refresher.record_view("2024-06-01", "2024-06-30")
+    refresher.record_view(*DEFAULT)
+    refresher.record_view(*DEFAULT)
+
+    assert refresher.ranges_to_warm() == [DEFAULT, ("2024-01-01", "2024-03-31")]
+    refresher.current()
+    assert warehouse.warmed == [("w1", [DEFAULT, ("2024-01-01", "2024-03-31")])]
+    # Halved after the refresh: the one-off range falls away.
+    assert dict(refresher.views) == {("2024-01-01", "2024-03-31"): 2, DEFAULT: 1}
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from axl_staking import rolling
+from axl_staking.rolling import RollingWindows, rolling_between
+
+EVENTS = [
+    ("2024-01-01", "delegate", "alice", 100),
+    ("2024-01-01", "delegate", "bob", 40),
+    ("2024-01-02", "undelegate", "alice", 30),
+    ("2024-01-04", "delegate", "carol", 25),
+    ("2024-01-04", "redelegate", "dave", 500, "val-b", "val-a"),
+    ("2024-01-06", "delegate", "bob", 5),
+    ("2024-01-06", "undelegate", "carol", 25),
+    ("2024-01-09", "delegate", "erin", 12.5),
+]
+
+
+@pytest.fixture
+def cube(make_cube):
+    return make_cube(EVENTS)
+
+
+def daily(events, action):
+    # Per-day amount and message totals of `action` on the consecutive day grid, as plain pandas.
+    frame = events[events["Action"] == action].groupby("Date")[["Amount", "Events"]].sum()
+    return frame.reindex(pd.date_range("2024-01-01", "2024-01-09", freq="D"), fill_value=0)
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 7, 30])
+def test_trailing_sums_match_pandas_rolling(cube, make_events, window):
+    events = make_events(EVENTS)
+    delegate, undelegate = daily(events, "delegate"), daily(events, "undelegate")
+    expected = {
+        "Delegated": delegate["Amount"],
+        "Undelegated": undelegate["Amount"],
+        "Net Flow": delegate["Amount"] - undelegate["Amount"],
+        "Messages": delegate["Events"] + undelegate["Events"],
+    }
+
+    out = RollingWindows.from_cube(cube).window(window)
+
+    assert out["Date"].tolist() == list(pd.date_range("2024-01-01", "2024-01-09", freq="D"))
+    for name, series in expected.items():
+        trailing = series.rolling(window, min_periods=1).sum()
+        np.testing.assert_allclose(out[name].to_numpy(dtype=float), trailing.round(1).to_numpy(dtype=float))
+    np.testing.assert_allclose(out["Net Flow Avg"].to_numpy(dtype=float),
+                               (expected["Net Flow"].rolling(window, min_periods=1).sum() / window).round(1))
+
+
+def test_unique_delegators_over_trailing_windows(cube):
+    out = RollingWindows.from_cube(cube).window(3)
+
+    # Delegations only: {alice, bob}, {alice, bob}, {alice, bob}, {carol}, {carol}, {carol, bob}, {bob}, {bob}, {erin}.
+    assert out["Delegators"].tolist() == [2, 2, 2, 1, 1, 2, 1, 1, 1]
+
+
+def test_empty_cube_has_no_rows(make_cube):
+    out = RollingWindows.from_cube(make_cube([("2024-01-01", "redelegate", "dave", 5, "val-b", "val-a")])).window(7)
+
+    assert out.empty
+    assert out.columns.tolist() == ["Date", "Delegated", "Undelegated", "Net Flow", "Net Flow Avg", "Messages", "Delegators"]
+
+
+def test_rolling_between_keeps_windows_reaching_before_the_range(cube):
+    full = RollingWindows.from_cube(cube).window(7)
+    ranged = rolling_between(full, "2024-01-06", "2024-01-07")
+
+    assert ranged["Date"].tolist() == [pd.Timestamp("2024-01-06"), pd.Timestamp("2024-01-07")]
+    # 2024-01-06 still counts the 2024-01-01 delegations of its 7-day window.
+    assert ranged["Delegated"].tolist() == [170.0, 170.0]
+    assert ranged.index.tolist() == [0, 1]
+    assert len(rolling_between(full)) == len(full)
+    assert rolling_between(full, "2024-02-01", "2024-02-29").empty
+
+
+def test_daily_share_splits_new_and_active_stakers(make_cube):
+    cube = make_cube([
+        ("2024-01-01", "delegate", "alice", 100),
+        ("2024-02-01", "delegate", "carol", 7),
+        ("2024-03-05", "delegate", "bob", 40),
+        ("2024-03-06", "undelegate", "alice", 10),
+        ("2024-03-10", "delegate", "alice", 25),
+        ("2024-03-10", "delegate", "bob", 5),
+    ])
+
+    # Delegations since 2024-02-29; new stakers first delegated on or after 2024-03-03.
+    share = rolling.daily_share_delegated_amount(cube, window_days=10, new_days=7)
+
+    assert share.columns.tolist() == ["Date", "Type", "Delegated Amount"]
+    assert list(share.itertuples(index=False, name=None)) == [
+        (pd.Timestamp("2024-03-05"), "New Stakers", 40.0),
+        (pd.Timestamp("2024-03-10"), "Active Stakers", 25.0),
+        (pd.Timestamp("2024-03-10"), "New Stakers", 5.0),
+    ]
+    totals = rolling.share_amount(share)
+    assert dict(zip(totals["Type"], totals["Delegated Amount"])) == {"Active Stakers": 25.0, "New Stakers": 45.0}
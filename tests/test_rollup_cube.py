@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+CUBE_ROWS = [
+    ("2024-01-01", "delegate", "alice", 100, "val-a"),
+    ("2024-01-01", "delegate", "bob", 5, "val-b"),
+    ("2024-01-02", "delegate", "alice", 50, "val-a"),
+    ("2024-01-03", "undelegate", "bob", 5, "val-b"),
+]
+# The tail as re-fetched from 2024-01-02: alice's delegation was corrected and new events arrived.
+TAIL_ROWS = [
+    ("2024-01-02", "delegate", "alice", 60, "val-a"),
+    ("2024-01-02", "delegate", "carol", 20, "val-c"),
+    ("2024-01-03", "undelegate", "bob", 5, "val-b"),
+    ("2024-01-04", "delegate", "bob", 1, "val-a"),
+]
+
+
+def plain_totals(cube, by=("Action",)):
+    totals = cube.reduce(cube.slice(), list(by))
+    return totals.astype({col: str for col in by}).sort_values(list(by)).reset_index(drop=True)
+
+
+def test_totals_match_the_warehouse_aggregates(make_cube):
+    # SUM(amount), SUM(txns), SUM(events), COUNT(DISTINCT delegator) GROUP BY action
+    totals = plain_totals(make_cube(CUBE_ROWS)).set_index("Action")
+
+    assert totals.loc["delegate", ["Amount", "Txns", "Events", "Users"]].tolist() == [155.0, 3, 3, 2]
+    assert totals.loc["undelegate", ["Amount", "Txns", "Events", "Users"]].tolist() == [5.0, 1, 1, 1]
+
+
+def test_with_tail_replaces_the_days_from_since(make_cube, make_events):
+    cube = make_cube(CUBE_ROWS)
+    updated = cube.with_tail("2024-01-02", make_events(TAIL_ROWS))
+    rebuilt = make_cube(CUBE_ROWS[:2] + TAIL_ROWS)
+
+    assert updated.last_day == pd.Timestamp("2024-01-04")
+    pd.testing.assert_frame_equal(plain_totals(updated), plain_totals(rebuilt))
+    pd.testing.assert_frame_equal(
+        plain_totals(updated, ("Action", "Validator")), plain_totals(rebuilt, ("Action", "Validator"))
+    )
+    totals = plain_totals(updated).set_index("Action")
+    assert totals.loc["delegate", ["Amount", "Txns", "Users"]].tolist() == [186.0, 5, 3]
+
+
+def test_with_tail_leaves_the_original_untouched(make_cube, make_events):
+    cube = make_cube(CUBE_ROWS)
+    cube.with_tail("2024-01-02", make_events(TAIL_ROWS))
+
+    assert len(cube) == 4
+    assert cube.last_day == pd.Timestamp("2024-01-03")
+    assert plain_totals(cube).set_index("Action").loc["delegate", "Amount"] == 155.0
+
+
+def test_with_tail_keeps_sketches_before_since(make_cube, make_events):
+    cube = make_cube(CUBE_ROWS)
+    cube.sketches("delegate")
+    updated = cube.with_tail("2024-01-02", make_events(TAIL_ROWS))
+
+    sketches = updated._sketches["delegate"]
+    assert list(pd.DatetimeIndex(sketches.days)) == list(pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-04"]))
+    assert sketches.count_between() == 3
+    assert sketches.count_between("2024-01-02", "2024-01-02") == 2
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    ("2024-01-01", "2024-01-01", 2),
+    ("2024-01-02", "2024-01-03", 2),
+    ("2024-01-04", "2024-01-31", 0),
+])
+def test_slice_bounds_are_inclusive(make_cube, start, end, expected):
+    assert len(make_cube(CUBE_ROWS).slice(start, end)) == expected
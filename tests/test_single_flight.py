@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+from axl_staking.single_flight import SingleFlight, private_dir
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="cross-process sharing needs fcntl")
+
+
+def test_private_dir_is_created_closed_to_others(tmp_path):
+    path = private_dir(str(tmp_path / "flights"))
+
+    assert os.stat(path).st_mode & 0o777 == 0o700
+
+
+def test_private_dir_rejects_a_directory_others_can_write(tmp_path):
+    path = tmp_path / "flights"
+    path.mkdir()
+    path.chmod(0o777)
+
+    with pytest.raises(PermissionError):
+        private_dir(str(path))
+    # Sharing is switched off rather than trusting the directory.
+    assert SingleFlight(lock_dir=str(path)).lock_dir is None
+
+
+def test_result_is_shared_then_expires(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path / "flights"), result_ttl_seconds=60)
+    calls = []
+
+    def query():
+        calls.append(1)
+        return pd.DataFrame({"x": [1, 2]})
+
+    assert flight.do("SELECT 1", None, query)["x"].tolist() == [1, 2]
+    assert flight.do("SELECT  1", None, query)["x"].tolist() == [1, 2]
+    assert len(calls) == 1
+    files = os.listdir(flight.lock_dir)
+    assert len(files) == 1 and files[0].endswith(".arrow")
+
+    # An expired result is removed by the next write and the query runs again.
+    result_path = os.path.join(flight.lock_dir, files[0])
+    os.utime(result_path, (0, 0))
+    flight.do("SELECT 2", None, query)
+    assert not os.path.exists(result_path)
+    assert len(calls) == 2
+
+
+def test_unshared_and_oversized_results_are_not_written(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path / "flights"), max_shared_bytes=1024)
+
+    flight.do("SELECT tail", None, lambda: pd.DataFrame({"x": [1]}), shared=False)
+    flight.do("SELECT ledger", None, lambda: pd.DataFrame({"x": range(1000)}))
+    assert os.listdir(flight.lock_dir) == []
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from axl_staking import datasets
+from axl_staking.memory import MemoryAccountant
+from axl_staking.rollup_cube import RollupCube
+from axl_staking.service import StakingService
+from axl_staking.snapshot_builder import build_datasets
+from axl_staking.snapshots import SnapshotSource, write_snapshot
+
+pytest.importorskip("pyarrow")
+
+ROWS = [
+    ("2024-01-01", "delegate", "alice", 100),
+    ("2024-01-02", "delegate", "bob", 40),
+    ("2024-02-03", "undelegate", "alice", 30),
+]
+DEFAULT = (pd.Timestamp("2024-01-01").date(), pd.Timestamp("2024-02-29").date())
+
+
+@pytest.fixture
+def snapshot(tmp_path, make_service):
+    warehouse = make_service(ROWS).source
+    write_snapshot(str(tmp_path), build_datasets(warehouse, *DEFAULT), warehouse.watermark, DEFAULT)
+    return SnapshotSource(str(tmp_path))
+
+
+def test_other_ranges_are_left_to_the_service_cube(snapshot, make_events):
+    january = (pd.Timestamp("2024-01-01").date(), pd.Timestamp("2024-01-31").date())
+    assert snapshot.range_summary(*DEFAULT) is not None
+    assert snapshot.top_delegators(*january) is None
+    assert snapshot.range_summary(*january) is None
+
+    service = StakingService(snapshot, accountant=MemoryAccountant(2**20), default_range=DEFAULT)
+    cube = RollupCube(make_events(ROWS))
+    pd.testing.assert_frame_equal(service.top_delegators(*january), datasets.top_delegators(cube, *january))
+    assert service.range_summary(*january)["Amount"].tolist() == datasets.range_summary(cube, *january)["Amount"].tolist()
+    # The daily ledger is read for the cube only, never cached by the source.
+    assert all(name != "staking_events" for _, name in snapshot._frames)
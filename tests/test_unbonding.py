@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from axl_staking.unbonding import UnbondingQueue
+
+
+def test_entries_release_at_maturity():
+    queue = UnbondingQueue(unbonding_days=7)
+    queue.push("2024-01-01 10:00", 5, "alice", "val-a")
+    queue.push("2024-01-03", 3, "bob", "val-b")
+
+    assert queue.unbonding == 8.0
+    assert queue.advance("2024-01-08 09:59") == 0.0
+    assert queue.advance("2024-01-08 10:00") == 5.0
+    assert (queue.unbonding, queue.released, len(queue)) == (3.0, 5.0, 1)
+    # The clock never runs backwards.
+    assert queue.advance("2024-01-01") == 0.0
+    assert queue.now == pd.Timestamp("2024-01-08 10:00")
+
+
+def test_already_matured_push_is_released_immediately():
+    queue = UnbondingQueue(unbonding_days=7)
+    queue.advance("2024-01-10")
+    queue.push("2024-01-02", 4)
+
+    assert (queue.unbonding, queue.released, len(queue)) == (0.0, 4.0, 0)
+
+
+def test_schedule():
+    queue = UnbondingQueue(unbonding_days=7)
+    queue.push("2024-01-01 10:00", 5)
+    queue.push("2024-01-03 00:00", 3)
+    queue.push("2024-01-03 12:00", 2)
+    schedule = queue.schedule()
+
+    assert list(schedule["Date"]) == list(pd.date_range("2024-01-08", "2024-01-10", freq="D"))
+    assert schedule["Unlock Amount"].tolist() == [5.0, 0.0, 5.0]
+    assert schedule["Cumulative Unlock"].tolist() == [5.0, 5.0, 10.0]
+
+
+CUBE_ROWS = [
+    ("2024-01-01", "undelegate", "alice", 4),
+    ("2024-01-02", "undelegate", "bob", 2),
+    ("2024-01-05", "undelegate", "carol", 6),
+    ("2024-01-09", "undelegate", "dave", 1),
+    ("2024-01-09", "delegate", "erin", 100),
+]
+
+
+def test_from_cube_holds_the_last_unbonding_period(make_cube):
+    # SUM(amount) of undelegations whose block time + 7 days is after the cube's last day.
+    queue = UnbondingQueue.from_cube(make_cube(CUBE_ROWS))
+
+    assert queue.now == pd.Timestamp("2024-01-09")
+    assert queue.unbonding == 7.0
+    # 2024-01-01 lies outside the seeded period; 2024-01-02 matures on 2024-01-09 itself.
+    assert queue.released == 2.0
+
+
+def test_from_cube_until(make_cube):
+    queue = UnbondingQueue.from_cube(make_cube(CUBE_ROWS), until="2024-01-05")
+
+    assert queue.unbonding == 12.0
+    assert queue.released == 0.0
+
+
+def test_with_tail_matches_a_full_rebuild(make_cube, make_events):
+    cube = make_cube(CUBE_ROWS)
+    queue = UnbondingQueue.from_cube(cube)
+    # 2024-01-09 re-fetched with dave's amount corrected, plus a new day.
+    updated_cube = cube.with_tail("2024-01-09", make_events([
+        ("2024-01-09", "undelegate", "dave", 1.5),
+        ("2024-01-10", "undelegate", "frank", 3),
+    ]))
+    updated = queue.with_tail(updated_cube, "2024-01-09")
+
+    assert updated.unbonding == pytest.approx(10.5)
+    assert updated.unbonding == pytest.approx(UnbondingQueue.from_cube(updated_cube).unbonding)
+    assert queue.unbonding == 7.0
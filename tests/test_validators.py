@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from axl_staking.validators import ValidatorStakeMatrix, active_sets, stake_concentration, validator_lifecycle
+
+JANUARY = [
+    ("2024-01-05", "delegate", "alice", 60, "val-a"),
+    ("2024-01-10", "delegate", "bob", 30, "val-b"),
+    ("2024-01-20", "delegate", "carol", 10, "val-c"),
+]
+FEBRUARY = [
+    ("2024-02-03", "undelegate", "alice", 35, "val-a"),
+    ("2024-02-10", "redelegate", "bob", 10, "val-c", "val-b"),
+    ("2024-02-12", "delegate", "erin", 15, "val-c"),
+    ("2024-02-20", "delegate", "dave", 20, "val-d"),
+]
+MARCH = [
+    ("2024-03-01", "delegate", "frank", 0.5, "val-e"),
+]
+MONTHS = list(pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]))
+# Net delegated stake per validator at each month end, as get_net_delegated_per_validator sums it: delegations and
+# redelegations in, undelegations and redelegations out of their source.
+STAKE = {
+    "val-a": [60, 25, 25],
+    "val-b": [30, 20, 20],
+    "val-c": [10, 35, 35],
+    "val-d": [0, 20, 20],
+    "val-e": [0, 0, 0.5],
+}
+
+
+@pytest.fixture
+def matrix(make_cube):
+    return ValidatorStakeMatrix.from_cube(make_cube(JANUARY + FEBRUARY + MARCH))
+
+
+def test_stake_matrix(matrix):
+    assert list(matrix.validators) == list(STAKE)
+    assert list(matrix.periods) == MONTHS
+    np.testing.assert_allclose(matrix.stake, np.array(list(STAKE.values())))
+
+
+def test_between_selects_the_periods_of_the_range(matrix):
+    ranged = matrix.between("2024-02-15", "2024-03-31")
+
+    assert list(ranged.periods) == MONTHS[1:]
+    np.testing.assert_allclose(ranged.stake, np.array(list(STAKE.values()))[:, 1:])
+
+
+def test_with_tail_matches_a_full_rebuild(make_cube, make_events):
+    cube = make_cube(JANUARY + FEBRUARY)
+    matrix = ValidatorStakeMatrix.from_cube(cube)
+    updated_cube = cube.with_tail("2024-02-01", make_events(FEBRUARY + MARCH))
+    updated = matrix.with_tail(updated_cube, "2024-02-01")
+    rebuilt = ValidatorStakeMatrix.from_cube(updated_cube)
+
+    assert list(updated.validators) == list(rebuilt.validators)
+    assert list(updated.periods) == list(rebuilt.periods)
+    np.testing.assert_allclose(updated.stake, rebuilt.stake)
+
+
+def test_stake_concentration(matrix):
+    concentration = stake_concentration(matrix)
+
+    assert list(concentration["Period"]) == MONTHS
+    assert concentration["Validators With Stake"].tolist() == [3, 4, 5]
+    # Fewest validators whose stake exceeds a third / two thirds of the total:
+    # Jan 60/30/10, Feb 35/25/20/20, Mar 35/25/20/20/0.5.
+    assert concentration["Nakamoto 33%"].tolist() == [1, 1, 1]
+    assert concentration["Nakamoto 67%"].tolist() == [2, 3, 3]
+    # Gini from the mean absolute difference over the validators holding stake, e.g. Jan: 200 / (2 * 3^2 * 100/3).
+    assert concentration["Gini"].tolist() == pytest.approx([0.3333, 0.125, 0.2945], abs=1e-4)
+    assert concentration["Top 10 Share"].tolist() == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_nakamoto_counts_validators_past_the_threshold(make_cube):
+    # Equal stakes: one validator holds exactly a third, which does not exceed it.
+    cube = make_cube([("2024-01-01", "delegate", f"d{i}", 10, f"val-{i}") for i in range(3)])
+    concentration = stake_concentration(ValidatorStakeMatrix.from_cube(cube))
+
+    assert concentration[["Nakamoto 33%", "Nakamoto 67%", "Gini"]].values.tolist() == [[2, 3, 0.0]]
+
+
+def test_active_sets(matrix):
+    # Top two by stake among validators holding at least 1 AXL; ties keep validator order.
+    active = active_sets(matrix, max_validators=2)
+    assert active.tolist() == [
+        [True, True, True],
+        [True, False, False],
+        [False, True, True],
+        [False, False, False],
+        [False, False, False],
+    ]
+    # Without the cap only the bonded minimum applies: val-e's 0.5 AXL never counts.
+    assert active_sets(matrix, max_validators=None)[:, 2].tolist() == [True, True, True, True, False]
+
+
+def test_validator_lifecycle(matrix):
+    capped = validator_lifecycle(matrix, max_validators=2)
+    assert capped[["Active Validators", "Entered", "Exited", "New Validators"]].values.tolist() == [
+        [2, 2, 0, 2],
+        [2, 1, 1, 1],
+        [2, 0, 0, 0],
+    ]
+    uncapped = validator_lifecycle(matrix)
+    assert uncapped[["Active Validators", "Entered", "Exited", "New Validators"]].values.tolist() == [
+        [3, 3, 0, 3],
+        [4, 1, 0, 1],
+        [4, 0, 0, 0],
+    ]
+
+
+def test_empty_cube(make_cube):
+    matrix = ValidatorStakeMatrix.from_cube(make_cube([("2024-01-01", "claim", "alice", 1)]))
+
+    assert len(matrix) == 0
+    assert stake_concentration(matrix).empty
+    assert validator_lifecycle(matrix).empty